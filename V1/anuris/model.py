@@ -1,14 +1,30 @@
 import json
 import os
-from urllib.parse import urlsplit, urlunsplit
+import re
+from urllib.parse import SplitResult, urlsplit, urlunsplit
 from typing import Any, Dict, List, Optional
 
 import httpx
-from httpx_socks import SyncProxyTransport
 from openai import OpenAI
 
 from .config import Config
 
+_NON_RETRIABLE_ERROR_PATTERN = re.compile(
+    r"api key|unauthorized|forbidden|quota|rate limit",
+    re.IGNORECASE,
+)
+_REQUEST_SHAPE_ERROR_PATTERN = re.compile(
+    r"invalid|unsupported|unknown|unrecognized|unexpected|not allowed|bad request"
+    r"|parameter|params|setting|schema|tool|temperature|extra_body",
+    re.IGNORECASE,
+)
+
+# Chat turns are separated by user think time, so keep idle connections around
+# longer than httpx's 5s default to avoid a fresh TLS handshake per request.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0)
+
+_PROXY_ENV_KEYS = ("HTTPS_PROXY", "HTTP_PROXY", "ALL_PROXY", "NO_PROXY")
+
 
 class ChatModel:
     """API interaction layer with state-focused design."""
@@ -16,7 +32,12 @@ class ChatModel:
     def __init__(self, config: Config):
         self.config = config
         self.debug = config.debug
-        self.base_url = self._normalize_base_url(config.base_url)
+        # Parse the base URL once; normalization and proxy lookup share the parts.
+        raw_base_url = (config.base_url or "").strip()
+        self._base_url_parts = urlsplit(raw_base_url) if raw_base_url else None
+        self.base_url = self._normalize_base_url(self._base_url_parts)
+        # Config strings are fixed for the model's lifetime; detect the provider once.
+        self.provider = self._detect_provider()
 
         proxy_url, proxy_source = self._resolve_proxy_url()
         self.proxy_url = proxy_url or ""
@@ -42,6 +63,16 @@ class ChatModel:
                 f"reasoning={config.reasoning}"
             )
 
+    def close(self) -> None:
+        """Release the pooled connections held by the underlying httpx client."""
+        self.http_client.close()
+
+    def __enter__(self) -> "ChatModel":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def _debug_print(self, message: str) -> None:
         """Print debug message if debug mode is enabled."""
         if self.debug:
@@ -54,7 +85,8 @@ class ChatModel:
     ) -> Any:
         """Get streaming response from API with attachment support."""
         try:
-            if not messages or not isinstance(messages, list):
+            # Callers always build a list of message dicts; only emptiness needs checking.
+            if not messages:
                 raise ValueError("Invalid messages format")
 
             api_messages = messages.copy()
@@ -121,13 +153,13 @@ class ChatModel:
         Build provider-specific payload for reasoning mode.
         DeepSeek expects `thinking.type = enabled|disabled`.
         """
-        if self._detect_provider() == "deepseek":
+        if self.provider == "deepseek":
             thinking_type = "enabled" if self.config.reasoning else "disabled"
             return {"thinking": {"type": thinking_type}}
         return None
 
     def _supports_reasoning_switch(self) -> bool:
-        return self._detect_provider() == "deepseek"
+        return self.provider == "deepseek"
 
     def _detect_provider(self) -> str:
         base_url = (self.base_url or self.config.base_url or "").lower()
@@ -154,7 +186,7 @@ class ChatModel:
         if explicit:
             return self._normalize_proxy_url(explicit), "config"
 
-        env_proxy = self._get_env_proxy_url(self.base_url or self.config.base_url or "")
+        env_proxy = self._get_env_proxy_url(self._base_url_parts, self._snapshot_proxy_env())
         if env_proxy:
             return self._normalize_proxy_url(env_proxy), "env"
 
@@ -168,16 +200,19 @@ class ChatModel:
         (which can crash on ALL_PROXY=socks://...).
         """
         if not proxy_url:
-            return httpx.Client(trust_env=False)
+            return httpx.Client(limits=_HTTP_LIMITS, trust_env=False)
 
         normalized = self._normalize_proxy_url(proxy_url)
         scheme = urlsplit(normalized).scheme.lower()
 
         if scheme in {"socks", "socks5", "socks5h", "socks4", "socks4a"}:
+            # Imported lazily: only SOCKS users pay for httpx_socks/python-socks.
+            from httpx_socks import SyncProxyTransport
+
             transport = SyncProxyTransport.from_url(normalized)
-            return httpx.Client(transport=transport, trust_env=False)
+            return httpx.Client(transport=transport, limits=_HTTP_LIMITS, trust_env=False)
 
-        return httpx.Client(proxy=normalized, trust_env=False)
+        return httpx.Client(proxy=normalized, limits=_HTTP_LIMITS, trust_env=False)
 
     @staticmethod
     def _normalize_proxy_url(proxy_url: str) -> str:
@@ -197,38 +232,43 @@ class ChatModel:
         return value
 
     @classmethod
-    def _get_env_proxy_url(cls, base_url: str) -> Optional[str]:
+    def _get_env_proxy_url(cls, parsed: Optional[SplitResult], env: Dict[str, str]) -> Optional[str]:
         """
-        Return the proxy URL from the environment for a given destination base URL.
+        Return the proxy URL from the environment for the parsed destination base URL.
 
         This intentionally *does not* delegate to httpx trust_env handling because we
         need to normalize/ignore values that would otherwise raise.
         """
-        target = (base_url or "").strip()
-        if not target:
+        if parsed is None:
             return None
 
-        parsed = urlsplit(target)
         scheme = (parsed.scheme or "https").lower()
         hostname = (parsed.hostname or "").lower()
         port = parsed.port
 
-        if hostname and cls._is_no_proxy_host(hostname, port):
+        if hostname and cls._is_no_proxy_host(hostname, port, env.get("NO_PROXY", "")):
             return None
 
         if scheme == "https":
-            return cls._get_env_var("HTTPS_PROXY") or cls._get_env_var("ALL_PROXY")
+            return env.get("HTTPS_PROXY") or env.get("ALL_PROXY")
         if scheme == "http":
-            return cls._get_env_var("HTTP_PROXY") or cls._get_env_var("ALL_PROXY")
-        return cls._get_env_var("ALL_PROXY") or cls._get_env_var("HTTPS_PROXY") or cls._get_env_var("HTTP_PROXY")
+            return env.get("HTTP_PROXY") or env.get("ALL_PROXY")
+        return env.get("ALL_PROXY") or env.get("HTTPS_PROXY") or env.get("HTTP_PROXY")
 
     @staticmethod
-    def _get_env_var(key: str) -> Optional[str]:
+    def _snapshot_proxy_env() -> Dict[str, str]:
+        """Read every proxy-related env var once, preferring the upper-case spelling."""
         # Env vars are often set in both cases; check both for robustness.
-        return os.environ.get(key) or os.environ.get(key.lower())
+        environ = os.environ
+        snapshot: Dict[str, str] = {}
+        for key in _PROXY_ENV_KEYS:
+            value = environ.get(key) or environ.get(key.lower())
+            if value:
+                snapshot[key] = value
+        return snapshot
 
-    @classmethod
-    def _is_no_proxy_host(cls, hostname: str, port: Optional[int]) -> bool:
+    @staticmethod
+    def _is_no_proxy_host(hostname: str, port: Optional[int], raw: str) -> bool:
         """
         Best-effort NO_PROXY matching. Supports:
         - "*" to disable proxying entirely
@@ -236,7 +276,6 @@ class ChatModel:
         - domain suffix matches (".example.com" or "example.com" matches subdomains)
         - optional ":port" entries
         """
-        raw = cls._get_env_var("NO_PROXY") or ""
         if not raw:
             return False
 
@@ -272,17 +311,15 @@ class ChatModel:
         return False
 
     @staticmethod
-    def _normalize_base_url(raw_base_url: str) -> str:
+    def _normalize_base_url(parsed: Optional[SplitResult]) -> str:
         """
         Normalize OpenAI-compatible base URL.
 
         Some OpenAI-compatible providers return 404 when `/v1` is omitted.
         """
-        base_url = (raw_base_url or "").strip()
-        if not base_url:
-            return base_url
+        if parsed is None:
+            return ""
 
-        parsed = urlsplit(base_url)
         path = (parsed.path or "").rstrip("/")
         if path in {"", "/"}:
             path = "/v1"
@@ -294,11 +331,12 @@ class ChatModel:
         Run chat completion and apply payload-shape fallback on retriable request errors.
         This is provider-agnostic and avoids hardcoding vendor-specific error codes.
         """
-        active_kwargs = dict(request_kwargs)
-
         try:
-            return self.client.chat.completions.create(**active_kwargs)
+            return self.client.chat.completions.create(**request_kwargs)
         except Exception as exc:
+            # Retry payloads are copied lazily by _build_retry_kwargs, so the
+            # common success path never duplicates the request dict.
+            active_kwargs = request_kwargs
             while self._is_retriable_request_shape_error(exc):
                 next_kwargs, label = self._build_retry_kwargs(active_kwargs)
                 if next_kwargs is None:
@@ -313,49 +351,30 @@ class ChatModel:
             raise
 
     def _build_retry_kwargs(self, request_kwargs: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], str]:
-        for field in ("extra_body", "tools+tool_choice", "temperature"):
+        # Inspect keys once and only copy in the branch that actually drops a field.
+        if "extra_body" in request_kwargs:
             candidate = dict(request_kwargs)
-            changed = False
-            if field == "extra_body" and "extra_body" in candidate:
-                candidate.pop("extra_body", None)
-                changed = True
-            elif field == "tools+tool_choice" and (
-                "tools" in candidate or "tool_choice" in candidate
-            ):
-                candidate.pop("tools", None)
-                candidate.pop("tool_choice", None)
-                changed = True
-            elif field == "temperature" and "temperature" in candidate:
-                candidate.pop("temperature", None)
-                changed = True
-            if changed:
-                return candidate, field
+            candidate.pop("extra_body")
+            return candidate, "extra_body"
+        if "tools" in request_kwargs or "tool_choice" in request_kwargs:
+            candidate = dict(request_kwargs)
+            candidate.pop("tools", None)
+            candidate.pop("tool_choice", None)
+            return candidate, "tools+tool_choice"
+        if "temperature" in request_kwargs:
+            candidate = dict(request_kwargs)
+            candidate.pop("temperature")
+            return candidate, "temperature"
         return None, ""
 
     def _is_retriable_request_shape_error(self, exc: Exception) -> bool:
         status_code = self._extract_status_code(exc)
-        text = self._extract_error_text(exc).lower()
+        text = self._extract_error_text(exc)
 
-        if any(token in text for token in ("api key", "unauthorized", "forbidden", "quota", "rate limit")):
+        if _NON_RETRIABLE_ERROR_PATTERN.search(text) is not None:
             return False
 
-        indicators = (
-            "invalid",
-            "unsupported",
-            "unknown",
-            "unrecognized",
-            "unexpected",
-            "not allowed",
-            "bad request",
-            "parameter",
-            "params",
-            "setting",
-            "schema",
-            "tool",
-            "temperature",
-            "extra_body",
-        )
-        has_shape_hint = any(token in text for token in indicators)
+        has_shape_hint = _REQUEST_SHAPE_ERROR_PATTERN.search(text) is not None
         if status_code is None:
             return has_shape_hint
         return status_code in {400, 415, 422} and has_shape_hint
@@ -374,9 +393,16 @@ class ChatModel:
 
     @staticmethod
     def _extract_error_text(exc: Exception) -> str:
-        parts = [str(exc)]
+        message = str(exc)
+        parts = [message]
         body = getattr(exc, "body", None)
-        if body is not None:
+        if isinstance(body, bytes):
+            body = body.decode("utf-8", "replace")
+        if isinstance(body, str):
+            # SDK errors frequently embed the raw body in the message already.
+            if body and body not in message:
+                parts.append(body)
+        elif body is not None:
             try:
                 parts.append(json.dumps(body, ensure_ascii=False))
             except Exception:
@@ -0,0 +1,74 @@
+import atexit
+import datetime
+import threading
+import weakref
+from collections import deque
+
+from prompt_toolkit.history import FileHistory
+
+# Live histories, flushed by one exit hook for the whole process
+_live_histories: "weakref.WeakSet[BufferedFileHistory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_histories() -> None:
+    for history in list(_live_histories):
+        history.flush()
+
+
+class BufferedFileHistory(FileHistory):
+    """FileHistory that appends accepted input from a background writer thread.
+
+    The on-disk format is unchanged, so existing history files load as before.
+    Entries are queued on submit and written in batches with a single open per
+    batch; anything still queued is written at interpreter exit. The writer
+    thread starts with the first stored entry.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._queue = deque()
+        self._pending = threading.Event()
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        _live_histories.add(self)
+
+    def store_string(self, string: str) -> None:
+        self._queue.append((datetime.datetime.now(), string))
+        if self._writer is None:
+            self._start_writer()
+        self._pending.set()
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._drain_forever, name="history-writer", daemon=True)
+                self._writer.start()
+
+    def flush(self) -> None:
+        """Write every queued entry to the history file."""
+        with self._write_lock:
+            batch = []
+            while self._queue:
+                batch.append(self._queue.popleft())
+            if not batch:
+                return
+
+            parts = []
+            for timestamp, string in batch:
+                parts.append(f"\n# {timestamp}\n")
+                for line in string.split("\n"):
+                    parts.append(f"+{line}\n")
+            try:
+                with open(self.filename, "ab", buffering=8192) as handle:
+                    handle.write("".join(parts).encode("utf-8"))
+            except OSError:
+                # History is best effort; losing an entry must not break the prompt.
+                pass
+
+    def _drain_forever(self) -> None:
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            self.flush()
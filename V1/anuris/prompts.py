@@ -7,20 +7,31 @@ class PromptManager:
         self.project_dir = Path(__file__).resolve().parent.parent
         self.filename = Path("prompts") / filename
         self._cached_prompt = None
+        self._cached_key = None
 
     def get_prompt(self, force_reload: bool = False) -> str:
-        if self._cached_prompt and not force_reload:
+        prompt_file = self.project_dir / self.filename
+        try:
+            stat = prompt_file.stat()
+        except OSError:
+            stat = None
+
+        # (mtime_ns, size) identifies the on-disk revision, so edits are picked up
+        # without re-reading an unchanged file on every call.
+        key = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+        if self._cached_prompt is not None and key == self._cached_key and not force_reload:
             return self._cached_prompt
 
-        prompt_file = self.project_dir / self.filename
         try:
-            if prompt_file.exists():
+            if stat is not None:
                 self._cached_prompt = prompt_file.read_text(encoding="utf-8")
+                self._cached_key = key
                 return self._cached_prompt
         except Exception as exc:
             print(f"Error loading prompt from {prompt_file}: {exc}")
 
         self._cached_prompt = self._get_default_prompt()
+        self._cached_key = None
         return self._cached_prompt
 
     def resolve_prompt_source(self, source: str) -> str:
@@ -47,7 +58,9 @@ class PromptManager:
         prompt_file = self.project_dir / self.filename
         try:
             prompt_file.write_text(content, encoding="utf-8")
+            stat = prompt_file.stat()
             self._cached_prompt = content
+            self._cached_key = (stat.st_mtime_ns, stat.st_size)
             return True
         except Exception as exc:
             print(f"Error saving prompt: {exc}")
@@ -63,15 +63,14 @@ class ChatStateMachine:
         )
         self.stream_renderer = StreamRenderer(self.ui)
         self.current_state = ChatState.IDLE
-
-        self.transitions = {
-            ChatState.IDLE: self._handle_idle_state,
-            ChatState.WAITING_FOR_USER: self._handle_waiting_state,
-            ChatState.PROCESSING: self._handle_processing_state,
-            ChatState.RESPONDING: self._handle_responding_state,
-            ChatState.ERROR: self._handle_error_state,
-            ChatState.EXITING: lambda: ChatState.EXITING,
-        }
+        # Indexed by `state.value - 1`; every state before EXITING has a handler.
+        self._handlers = (
+            self._handle_idle_state,
+            self._handle_waiting_state,
+            self._handle_processing_state,
+            self._handle_responding_state,
+            self._handle_error_state,
+        )
 
         self.context = {
             "user_input": "",
@@ -83,17 +82,14 @@ class ChatStateMachine:
 
     def run(self) -> None:
         """Run the state machine until exit state is reached."""
-        while self.current_state != ChatState.EXITING:
-            next_state_handler = self.transitions.get(self.current_state)
-            if next_state_handler:
-                try:
-                    self.current_state = next_state_handler()
-                except Exception as exc:
-                    self.context["error_message"] = str(exc)
-                    self.current_state = ChatState.ERROR
-            else:
-                self.context["error_message"] = f"No handler for state: {self.current_state}"
-                self.current_state = ChatState.ERROR
+        handlers = self._handlers
+        state = self.current_state
+        try:
+            # Handlers that can fail (commands, API calls) route errors to ERROR themselves.
+            while state is not ChatState.EXITING:
+                state = self.current_state = handlers[state.value - 1]()
+        finally:
+            self.model.close()
 
     def _handle_idle_state(self) -> ChatState:
         """Initialize the chat application."""
@@ -112,7 +108,10 @@ class ChatStateMachine:
             return ChatState.WAITING_FOR_USER
 
         if user_input.lower() in ["q", "quit", "exit"]:
-            user_choice = Prompt.ask("Are you sure you want to quit? (y/n)", default="n").strip().lower()
+            try:
+                user_choice = Prompt.ask("Are you sure you want to quit? (y/n)", default="n").strip().lower()
+            except (EOFError, KeyboardInterrupt):
+                return ChatState.WAITING_FOR_USER
             if user_choice == "y":
                 self.ui.display_message("\nGoodbye!", style="yellow")
                 return ChatState.EXITING
@@ -127,11 +126,15 @@ class ChatStateMachine:
         """Process user input."""
         if self.context["is_command"]:
             cmd_parts = self.context["user_input"][1:].split(maxsplit=1)
-            cmd_name = cmd_parts[0]
+            cmd_name = cmd_parts[0] if cmd_parts else ""
             cmd_args = cmd_parts[1] if len(cmd_parts) > 1 else ""
 
-            if self.command_dispatcher.execute(cmd_name, cmd_args):
-                return ChatState.WAITING_FOR_USER
+            try:
+                if self.command_dispatcher.execute(cmd_name, cmd_args):
+                    return ChatState.WAITING_FOR_USER
+            except Exception as exc:
+                self.context["error_message"] = str(exc)
+                return ChatState.ERROR
 
             self.context["error_message"] = f"Unknown command: {cmd_name}"
             return ChatState.ERROR
@@ -288,11 +291,7 @@ class ChatStateMachine:
         self.ui.display_message(self.agent_runner.get_shutdown_snapshot(), style="cyan")
 
     def _provider_requires_reasoning_content(self) -> bool:
-        base_url = (self.config.base_url or "").lower()
-        model_name = (self.config.model or "").lower()
-        if "openrouter" in base_url or "openai.com" in base_url:
-            return False
-        return "deepseek" in base_url or "deepseek" in model_name
+        return self.model.provider == "deepseek"
 
     def _handle_error_state(self) -> ChatState:
         """Handle error state."""
@@ -1,8 +1,10 @@
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Callable
 
 from .ui import ChatUI
 
+__all__ = ["StreamRenderer", "StreamResult"]
+
 
 @dataclass
 class StreamResult:
@@ -13,15 +15,49 @@ class StreamResult:
     interrupted: bool
 
 
-@dataclass
+# Characters kept per reasoning detail to confirm the next chunk extends it.
+_DETAIL_TAIL_CHARS = 16
+
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+def _partial_tag_length(text: str, tag: str) -> int:
+    """Length of the longest suffix of `text` that is a proper prefix of `tag`."""
+    # Both tags contain a single "<", so only the last one can start a partial match.
+    start = text.rfind("<", max(0, len(text) - len(tag) + 1))
+    if start < 0:
+        return 0
+    return len(text) - start if tag.startswith(text[start:]) else 0
+
+
 class _RenderState:
-    full_response: str = ""
-    reasoning_content: str = ""
-    is_reasoning: bool = False
-    is_first_content: bool = True
-    in_think_tag: bool = False
-    buffered_content: str = ""
-    reasoning_detail_buffers: dict[int, str] = field(default_factory=dict)
+    """Mutable per-stream parser state; slotted because it is touched on every delta."""
+
+    __slots__ = (
+        "display",
+        "full_response_parts",
+        "reasoning_parts",
+        "is_reasoning",
+        "needs_header",
+        "in_think_tag",
+        "tag_match_len",
+        "reasoning_detail_buffers",
+        "pending_out",
+    )
+
+    def __init__(self, display: Callable[..., None]) -> None:
+        # Pre-bound `ui.display_message` for the per-flush write path.
+        self.display = display
+        self.full_response_parts: list[str] = []
+        self.reasoning_parts: list[str] = []
+        self.is_reasoning = False
+        self.needs_header = True
+        self.in_think_tag = False
+        self.tag_match_len = 0
+        self.reasoning_detail_buffers: dict[int, tuple[int, str]] = {}
+        # Text produced while handling one chunk, written with a single flush.
+        self.pending_out: list[str] = []
 
 
 class StreamRenderer:
@@ -31,80 +67,177 @@ class StreamRenderer:
         self.ui = ui
 
     def process(self, response_stream: Any) -> StreamResult:
-        state = _RenderState()
+        state = _RenderState(self.ui.display_message)
+        handle_chunk = None
 
         try:
             for chunk in response_stream:
-                delta = self._extract_openai_delta(chunk)
-                if delta is not None:
-                    if hasattr(delta, "reasoning_content") and delta.reasoning_content:
-                        self._enter_reasoning_mode(state)
-                        self._append_reasoning_text(delta.reasoning_content, state)
-                    if hasattr(delta, "reasoning_details") and delta.reasoning_details:
-                        self._process_reasoning_details(delta.reasoning_details, state)
-                    if hasattr(delta, "content") and delta.content:
-                        self._process_content_delta(delta.content, state)
-                else:
-                    self._process_anthropic_chunk(chunk, state)
+                if handle_chunk is None:
+                    # The chunk shape is fixed for a stream; pick a specialized handler once.
+                    handle_chunk = self._select_chunk_handler(chunk)
+                handle_chunk(chunk, state)
+                # Write before waiting on the network again, so a pause in the
+                # stream never holds back text that has already arrived.
+                self._flush_output(state)
 
             self._flush_buffered_content(state)
+            self._flush_output(state)
 
             return StreamResult(
-                full_response=state.full_response,
-                reasoning_content=state.reasoning_content,
+                full_response="".join(state.full_response_parts),
+                reasoning_content="".join(state.reasoning_parts),
                 interrupted=False,
             )
 
         except KeyboardInterrupt:
+            self._flush_output(state)
             return StreamResult(
-                full_response=state.full_response,
-                reasoning_content=state.reasoning_content,
+                full_response="".join(state.full_response_parts),
+                reasoning_content="".join(state.reasoning_parts),
                 interrupted=True,
             )
 
-    def _process_content_delta(self, content: str, state: _RenderState) -> None:
-        state.buffered_content += content
+    def _select_chunk_handler(self, chunk: Any) -> Callable[[Any, _RenderState], None]:
+        choices = getattr(chunk, "choices", None)
+        if choices:
+            delta = getattr(choices[0], "delta", None)
+            if self._is_sdk_delta(delta):
+                return self._handle_sdk_delta_chunk
+            return self._handle_openai_object_chunk
+        if isinstance(chunk, dict) and chunk.get("choices"):
+            return self._handle_openai_dict_chunk
+        return self._handle_generic_chunk
 
-        if not state.in_think_tag and "<think>" in state.buffered_content:
-            self._handle_think_start(state)
+    @staticmethod
+    def _is_sdk_delta(delta: Any) -> bool:
+        """True for OpenAI SDK deltas, where reasoning fields only appear as pydantic extras."""
+        if not isinstance(getattr(delta, "__pydantic_extra__", None), dict):
+            return False
+        declared = getattr(type(delta), "model_fields", {})
+        return "reasoning_content" not in declared and "reasoning_details" not in declared
+
+    def _handle_sdk_delta_chunk(self, chunk: Any, state: _RenderState) -> None:
+        choices = getattr(chunk, "choices", None)
+        delta = getattr(choices[0], "delta", None) if choices else None
+        extra = getattr(delta, "__pydantic_extra__", None)
+        if not isinstance(extra, dict):
+            self._handle_generic_chunk(chunk, state)
             return
-
-        if state.in_think_tag and "</think>" in state.buffered_content:
-            self._handle_think_end(state)
+        if extra:
+            self._apply_delta(extra.get("reasoning_content"), extra.get("reasoning_details"), delta.content, state)
             return
+        # No provider extras on this chunk: skip the reasoning probes entirely.
+        content = delta.content
+        if content:
+            self._process_content_delta(content, state)
 
-        if not state.in_think_tag and "<think>" not in state.buffered_content:
-            self._switch_to_answer_mode(state, reset_first_content=True)
-            self._append_answer_text(content, state)
-            state.buffered_content = ""
+    def _handle_openai_object_chunk(self, chunk: Any, state: _RenderState) -> None:
+        choices = getattr(chunk, "choices", None)
+        delta = getattr(choices[0], "delta", None) if choices else None
+        if delta is None:
+            self._handle_generic_chunk(chunk, state)
             return
+        self._apply_delta(
+            getattr(delta, "reasoning_content", None),
+            getattr(delta, "reasoning_details", None),
+            getattr(delta, "content", None),
+            state,
+        )
+
+    def _handle_openai_dict_chunk(self, chunk: Any, state: _RenderState) -> None:
+        choices = chunk.get("choices") if isinstance(chunk, dict) else None
+        delta = choices[0].get("delta") if isinstance(choices, list) and choices else None
+        if not isinstance(delta, dict):
+            self._handle_generic_chunk(chunk, state)
+            return
+        self._apply_delta(
+            delta.get("reasoning_content"),
+            delta.get("reasoning_details"),
+            delta.get("content"),
+            state,
+        )
+
+    def _handle_generic_chunk(self, chunk: Any, state: _RenderState) -> None:
+        delta = self._extract_openai_delta(chunk)
+        if delta is None:
+            self._process_anthropic_chunk(chunk, state)
+            return
+        if isinstance(delta, dict):
+            self._apply_delta(
+                delta.get("reasoning_content"),
+                delta.get("reasoning_details"),
+                delta.get("content"),
+                state,
+            )
+            return
+        self._apply_delta(
+            getattr(delta, "reasoning_content", None),
+            getattr(delta, "reasoning_details", None),
+            getattr(delta, "content", None),
+            state,
+        )
+
+    def _apply_delta(self, reasoning_content: Any, reasoning_details: Any, content: Any, state: _RenderState) -> None:
+        if reasoning_content:
+            if not state.is_reasoning:
+                self._enter_reasoning_mode(state)
+            self._append_reasoning_text(reasoning_content, state)
+        if reasoning_details:
+            self._process_reasoning_details(reasoning_details, state)
+        if content:
+            self._process_content_delta(content, state)
 
-        if state.in_think_tag and "</think>" not in state.buffered_content:
-            self._enter_reasoning_mode(state)
-            self._append_reasoning_text(content, state)
-            state.buffered_content = ""
-
-    def _handle_think_start(self, state: _RenderState) -> None:
-        tag_pos = state.buffered_content.find("<think>")
-        pre_tag_content = state.buffered_content[:tag_pos]
-
+    def _process_content_delta(self, content: str, state: _RenderState) -> None:
+        # Incremental tag matcher: `tag_match_len` counts how many characters of
+        # the expected tag ended the previous delta, so each character is scanned once.
+        while content:
+            tag = _THINK_CLOSE if state.in_think_tag else _THINK_OPEN
+            matched = state.tag_match_len
+            if matched:
+                remainder = tag[matched:]
+                if content.startswith(remainder):
+                    state.tag_match_len = 0
+                    self._cross_tag("", state)
+                    content = content[len(remainder) :]
+                    continue
+                if remainder.startswith(content):
+                    state.tag_match_len += len(content)
+                    return
+                # A broken partial match cannot overlap a new tag (single "<"),
+                # so the held prefix is plain text.
+                state.tag_match_len = 0
+                self._emit_text(tag[:matched], state)
+
+            head, found, rest = content.partition(tag)
+            if not found:
+                break
+            self._cross_tag(head, state)
+            content = rest
+
+        if not content:
+            return
+        keep = _partial_tag_length(content, tag)
+        if keep:
+            state.tag_match_len = keep
+            content = content[:-keep]
+        if content:
+            self._emit_text(content, state)
+
+    def _cross_tag(self, head: str, state: _RenderState) -> None:
+        if state.in_think_tag:
+            self._handle_think_end(head, state)
+        else:
+            self._handle_think_start(head, state)
+
+    def _handle_think_start(self, pre_tag_content: str, state: _RenderState) -> None:
         if pre_tag_content:
-            self._switch_to_answer_mode(state, reset_first_content=True)
+            self._switch_to_answer_mode(state)
             self._append_answer_text(pre_tag_content, state)
 
         state.in_think_tag = True
         self._enter_reasoning_mode(state)
 
-        think_content = state.buffered_content[tag_pos + 7 :]
-        if think_content:
-            self._append_reasoning_text(think_content, state)
-
-        state.buffered_content = think_content
-
-    def _handle_think_end(self, state: _RenderState) -> None:
-        tag_pos = state.buffered_content.find("</think>")
-        think_part = state.buffered_content[:tag_pos]
-
+    def _handle_think_end(self, think_part: str, state: _RenderState) -> None:
         if think_part:
             self._enter_reasoning_mode(state)
             self._append_reasoning_text(think_part, state)
@@ -112,42 +245,55 @@ class StreamRenderer:
         state.in_think_tag = False
         state.is_reasoning = True
 
-        post_tag_content = state.buffered_content[tag_pos + 8 :]
-
-        if post_tag_content:
-            self._switch_to_answer_mode(state, reset_first_content=False)
-            self._append_answer_text(post_tag_content, state)
-
-        state.buffered_content = post_tag_content
+    def _emit_text(self, content: str, state: _RenderState) -> None:
+        # Per-delta path: only call the mode helpers when the mode actually changes.
+        if state.in_think_tag:
+            if not state.is_reasoning:
+                self._enter_reasoning_mode(state)
+            self._append_reasoning_text(content, state)
+        else:
+            if state.is_reasoning:
+                self._switch_to_answer_mode(state)
+            self._append_answer_text(content, state)
 
     def _flush_buffered_content(self, state: _RenderState) -> None:
-        if state.buffered_content and not state.in_think_tag:
-            self._switch_to_answer_mode(state, reset_first_content=False)
-            self._append_answer_text(state.buffered_content, state)
+        if state.tag_match_len:
+            tag = _THINK_CLOSE if state.in_think_tag else _THINK_OPEN
+            self._emit_text(tag[: state.tag_match_len], state)
+            state.tag_match_len = 0
 
     def _enter_reasoning_mode(self, state: _RenderState) -> None:
         if not state.is_reasoning:
+            self._flush_output(state)
             self.ui.display_message("\n[Reasoning Chain]", style="bold yellow")
             state.is_reasoning = True
 
-    def _switch_to_answer_mode(self, state: _RenderState, reset_first_content: bool) -> None:
+    def _switch_to_answer_mode(self, state: _RenderState) -> None:
         if state.is_reasoning:
+            self._flush_output(state)
             self.ui.display_separator()
             state.is_reasoning = False
-            if reset_first_content:
-                state.is_first_content = True
 
     def _append_reasoning_text(self, content: str, state: _RenderState) -> None:
-        state.reasoning_content += content
-        self.ui.display_message(content, end="", flush=True)
+        state.reasoning_parts.append(content)
+        self._write_output(content, state)
 
     def _append_answer_text(self, content: str, state: _RenderState) -> None:
-        if state.is_first_content and not state.full_response:
+        if state.needs_header:
+            self._flush_output(state)
             self.ui.display_message("\nAnuris: ", style="bold blue", end="")
-            state.is_first_content = False
+            state.needs_header = False
+
+        state.full_response_parts.append(content)
+        self._write_output(content, state)
 
-        state.full_response += content
-        self.ui.display_message(content, end="", flush=True)
+    def _write_output(self, content: str, state: _RenderState) -> None:
+        state.pending_out.append(content)
+
+    def _flush_output(self, state: _RenderState) -> None:
+        if state.pending_out:
+            state.display("".join(state.pending_out), end="", flush=True)
+            state.pending_out = []
 
     def _extract_openai_delta(self, chunk: Any) -> Any:
         choices = getattr(chunk, "choices", None)
@@ -159,77 +305,81 @@ class StreamRenderer:
             if isinstance(choices, list) and choices:
                 delta = choices[0].get("delta")
                 if isinstance(delta, dict):
-                    return type("OpenAIDelta", (), delta)()
+                    return delta
         return None
 
     def _process_anthropic_chunk(self, chunk: Any, state: _RenderState) -> None:
-        payload = self._to_mapping(chunk)
-        if not payload:
+        field = self._field
+        handler = self._ANTHROPIC_EVENT_HANDLERS.get(str(field(chunk, "type", "")))
+        if handler is not None:
+            handler(self, chunk, state)
             return
 
-        event_type = str(payload.get("type", ""))
-        if event_type == "content_block_start":
-            content_block = payload.get("content_block", {})
-            self._process_anthropic_content_block(content_block, state)
-            return
-        if event_type == "content_block_delta":
-            delta = payload.get("delta", {})
+        # Best effort: some wrappers emit direct Anthropic-like `delta` without event type.
+        delta = field(chunk, "delta")
+        if delta is not None:
             self._process_anthropic_delta(delta, state)
-            return
-        if event_type == "message_start":
-            message = payload.get("message", {})
-            content = message.get("content")
-            if isinstance(content, list):
-                for block in content:
-                    self._process_anthropic_content_block(block, state)
-            return
 
-        # Best effort: some wrappers emit direct Anthropic-like `delta` without event type.
-        if "delta" in payload:
-            self._process_anthropic_delta(payload.get("delta", {}), state)
+    def _on_content_block_start(self, payload: Any, state: _RenderState) -> None:
+        self._process_anthropic_content_block(self._field(payload, "content_block"), state)
+
+    def _on_content_block_delta(self, payload: Any, state: _RenderState) -> None:
+        self._process_anthropic_delta(self._field(payload, "delta"), state)
+
+    def _on_message_start(self, payload: Any, state: _RenderState) -> None:
+        content = self._field(self._field(payload, "message"), "content")
+        if isinstance(content, list):
+            for block in content:
+                self._process_anthropic_content_block(block, state)
+
+    def _ignore_event(self, payload: Any, state: _RenderState) -> None:
+        return None
+
+    # Known event types dispatch in one lookup; events without text are dropped
+    # here instead of falling through to the bare-`delta` heuristic.
+    _ANTHROPIC_EVENT_HANDLERS = {
+        "content_block_start": _on_content_block_start,
+        "content_block_delta": _on_content_block_delta,
+        "message_start": _on_message_start,
+        "content_block_stop": _ignore_event,
+        "message_delta": _ignore_event,
+        "message_stop": _ignore_event,
+        "ping": _ignore_event,
+    }
 
     def _process_anthropic_content_block(self, block: Any, state: _RenderState) -> None:
-        data = self._to_mapping(block)
-        if not data:
-            return
-        block_type = str(data.get("type", ""))
+        field = self._field
+        block_type = field(block, "type")
         if block_type == "text":
-            text = str(data.get("text", "") or "")
+            text = field(block, "text")
             if text:
                 self._process_content_delta(text, state)
-        elif block_type in {"thinking", "redacted_thinking"}:
-            thinking = str(data.get("thinking", "") or data.get("text", "") or "")
+        elif block_type == "thinking" or block_type == "redacted_thinking":
+            thinking = field(block, "thinking") or field(block, "text")
             if thinking:
                 self._enter_reasoning_mode(state)
                 self._append_reasoning_text(thinking, state)
 
     def _process_anthropic_delta(self, delta: Any, state: _RenderState) -> None:
-        data = self._to_mapping(delta)
-        if not data:
-            return
-        delta_type = str(data.get("type", ""))
+        field = self._field
+        delta_type = field(delta, "type")
         if delta_type == "text_delta":
-            text = str(data.get("text", "") or "")
+            text = field(delta, "text")
             if text:
                 self._process_content_delta(text, state)
-        elif delta_type in {"thinking_delta", "signature_delta"}:
-            thinking = str(data.get("thinking", "") or data.get("text", "") or "")
+        elif delta_type == "thinking_delta" or delta_type == "signature_delta":
+            thinking = field(delta, "thinking") or field(delta, "text")
             if thinking:
-                self._enter_reasoning_mode(state)
+                if not state.is_reasoning:
+                    self._enter_reasoning_mode(state)
                 self._append_reasoning_text(thinking, state)
 
     @staticmethod
-    def _to_mapping(value: Any) -> dict:
+    def _field(value: Any, key: str, default: Any = None) -> Any:
+        """Read one field from a dict or SDK event object without serializing it."""
         if isinstance(value, dict):
-            return value
-        model_dump = getattr(value, "model_dump", None)
-        if callable(model_dump):
-            dumped = model_dump()
-            if isinstance(dumped, dict):
-                return dumped
-        if hasattr(value, "__dict__"):
-            return dict(value.__dict__)
-        return {}
+            return value.get(key, default)
+        return getattr(value, key, default)
 
     def _process_reasoning_details(self, details: Any, state: _RenderState) -> None:
         for index, detail in enumerate(details):
@@ -241,13 +391,17 @@ class StreamRenderer:
             if not text:
                 continue
 
-            previous = state.reasoning_detail_buffers.get(index, "")
-            if text.startswith(previous):
-                delta_text = text[len(previous) :]
+            # Providers usually resend the accumulated text. Comparing only a short
+            # tail at the previous length keeps this O(1) instead of re-checking
+            # the whole prefix; a mismatch means the detail restarted.
+            previous_len, previous_tail = state.reasoning_detail_buffers.get(index, (0, ""))
+            if len(text) >= previous_len and text[previous_len - len(previous_tail) : previous_len] == previous_tail:
+                delta_text = text[previous_len:]
             else:
                 delta_text = text
-            state.reasoning_detail_buffers[index] = text
+            state.reasoning_detail_buffers[index] = (len(text), text[-_DETAIL_TAIL_CHARS:])
 
             if delta_text:
-                self._enter_reasoning_mode(state)
+                if not state.is_reasoning:
+                    self._enter_reasoning_mode(state)
                 self._append_reasoning_text(delta_text, state)
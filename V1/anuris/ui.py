@@ -1,30 +1,96 @@
 import os
 import shutil
-from typing import Any, Dict, List
+import signal
+import sys
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.keys import Keys
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+# prompt_toolkit and rich pull in hundreds of submodules, so they are imported
+# where ChatUI first needs them rather than when this module is loaded.
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+
+# prompt_toolkit swaps in its own SIGWINCH handler while prompting, so the
+# cached width is also re-read once it is older than this many seconds.
+_SEPARATOR_TTL = 2.0
+
+# Ctrl+Z/Ctrl+Y keep at most this many buffer snapshots each.
+_UNDO_DEPTH = 128
 
 
 class ChatUI:
     """User interface components managed declaratively."""
 
+    _WELCOME_TEMPLATE = """
+            [cyan]Anuris_API_CLI[/cyan] (Model: [green]{model}[/green])
+
+            [yellow]Enter 'q' or 'exit' or 'quit' to quit[/yellow]
+
+            [bold magenta]Commands:[/bold magenta]
+            [blue]- /clear[/blue]    : Clear chat history
+            [blue]- /save[/blue]     : Save chat history
+            [blue]- /load[/blue]     : Load chat history
+            [blue]- /attach[/blue]   : Attach file(s)
+            [blue]- /detach[/blue]   : Remove attachment(s)
+            [blue]- /files[/blue]    : List attachments
+            [blue]- /agent[/blue]    : Toggle agent mode
+            [blue]- /todos[/blue]    : Show todo board
+            [blue]- /help[/blue]     : Show help
+
+            [bold magenta]Shortcuts:[/bold magenta]
+            [green]- Enter[/green]: Send message
+            [green]- Ctrl+D[/green]: Send message
+            [green]- Ctrl+V[/green]: Paste
+            [green]- Ctrl+Z[/green]: Undo
+            [green]- Ctrl+Y[/green]: Redo
+            [green]- Up/Down[/green]: Navigate history
+            """
+
     def __init__(self):
-        self.console = Console()
+        from rich.console import Console
+
+        # Piped output carries no color, so skip Rich's auto-highlighting pass.
+        self.console = Console(highlight=sys.stdout.isatty())
         self.separator_pattern = "*-"
+        self._separator_cache: Optional[tuple[int, str]] = None
+        self._separator_checked_at = 0.0
+        self._welcome_cache: Dict[str, Any] = {}
+        self._attachment_columns: Optional[tuple] = None
+        self._install_resize_handler()
         self.session = self._create_prompt_session()
 
-    def _create_prompt_session(self) -> PromptSession:
+    def _install_resize_handler(self) -> None:
+        """Drop the cached separator on terminal resize where SIGWINCH exists."""
+        sigwinch = getattr(signal, "SIGWINCH", None)
+        if sigwinch is None:
+            return
+        try:
+            previous = signal.getsignal(sigwinch)
+
+            def _on_resize(signum, frame):
+                self._separator_cache = None
+                if callable(previous):
+                    previous(signum, frame)
+
+            signal.signal(sigwinch, _on_resize)
+        except ValueError:
+            # Not on the main thread; the TTL alone keeps the width fresh.
+            pass
+
+    def _create_prompt_session(self) -> "PromptSession":
         """Factory method for prompt session with key bindings."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.history import ThreadedHistory
+        from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.keys import Keys
+
+        from .prompt_history import BufferedFileHistory
+
         key_bindings = KeyBindings()
-        undo_stack = []
-        redo_stack = []
+        undo_stack = deque(maxlen=_UNDO_DEPTH)
+        redo_stack = deque(maxlen=_UNDO_DEPTH)
 
         @key_bindings.add(Keys.Enter, eager=True)
         def _(event):
@@ -71,19 +137,25 @@ class ChatUI:
                 event.current_buffer.text = next_state
 
         return PromptSession(
-            history=FileHistory(os.path.expanduser("~/.chat_history")),
+            history=ThreadedHistory(BufferedFileHistory(os.path.expanduser("~/.chat_history"))),
             auto_suggest=AutoSuggestFromHistory(),
             key_bindings=key_bindings,
         )
 
     def display_separator(self) -> None:
         """Display a visual separator."""
-        terminal_width = shutil.get_terminal_size().columns
-        repeat_count = terminal_width // len(self.separator_pattern)
-        separator = self.separator_pattern * repeat_count
-        if len(separator) < terminal_width:
-            separator += separator[0]
-        self.console.print(f"\n{separator}\n", style="bold yellow")
+        now = time.monotonic()
+        cached = self._separator_cache
+        if cached is None or now - self._separator_checked_at >= _SEPARATOR_TTL:
+            terminal_width = shutil.get_terminal_size().columns
+            self._separator_checked_at = now
+            if cached is None or cached[0] != terminal_width:
+                repeat_count = terminal_width // len(self.separator_pattern)
+                separator = self.separator_pattern * repeat_count
+                if len(separator) < terminal_width:
+                    separator += separator[0]
+                cached = self._separator_cache = (terminal_width, f"\n{separator}\n")
+        self.console.print(cached[1], style="bold yellow")
 
     def display_prompt(self) -> str:
         """Get user input through prompt."""
@@ -100,13 +172,19 @@ class ChatUI:
     def display_message(self, content: str, style: str = None, end: str = "\n", flush: bool = False) -> None:
         """Display a message to the user."""
         if flush:
-            print(content, end=end, flush=True)
+            # Raw streamed text: StreamRenderer already batches it, so skip Rich
+            # markup parsing and print()'s argument handling and write once.
+            stream = sys.stdout
+            stream.write(content + end if end else content)
+            stream.flush()
         else:
             self.console.print(content, style=style, end=end)
 
     def display_reasoning(self, content: str) -> None:
         """Display reasoning chain."""
         if content and content.strip():
+            from rich.panel import Panel
+
             self.console.print(
                 Panel.fit(
                     content,
@@ -122,11 +200,18 @@ class ChatUI:
         if not attachments:
             return
 
-        table = Table(title="Attachments", title_style="bold cyan")
-        table.add_column("#", style="dim", width=3)
-        table.add_column("Name", style="green")
-        table.add_column("Type", style="blue")
-        table.add_column("Size", style="yellow")
+        from rich.table import Column, Table
+
+        columns = self._attachment_columns
+        if columns is None:
+            columns = self._attachment_columns = (
+                Column("#", style="dim", width=3),
+                Column("Name", style="green"),
+                Column("Type", style="blue"),
+                Column("Size", style="yellow"),
+            )
+        # Columns collect their cells, so each table gets empty copies.
+        table = Table(*[column.copy() for column in columns], title="Attachments", title_style="bold cyan")
 
         for attachment in attachments:
             table.add_row(
@@ -140,35 +225,14 @@ class ChatUI:
 
     def display_welcome(self, model: str) -> None:
         """Display welcome message with attachment info."""
-        welcome_text = f"""
-            [cyan]Anuris_API_CLI[/cyan] (Model: [green]{model}[/green])
-
-            [yellow]Enter 'q' or 'exit' or 'quit' to quit[/yellow]
-
-            [bold magenta]Commands:[/bold magenta]
-            [blue]- /clear[/blue]    : Clear chat history
-            [blue]- /save[/blue]     : Save chat history
-            [blue]- /load[/blue]     : Load chat history
-            [blue]- /attach[/blue]   : Attach file(s)
-            [blue]- /detach[/blue]   : Remove attachment(s)
-            [blue]- /files[/blue]    : List attachments
-            [blue]- /agent[/blue]    : Toggle agent mode
-            [blue]- /todos[/blue]    : Show todo board
-            [blue]- /help[/blue]     : Show help
+        panel = self._welcome_cache.get(model)
+        if panel is None:
+            from rich.panel import Panel
 
-            [bold magenta]Shortcuts:[/bold magenta]
-            [green]- Enter[/green]: Send message
-            [green]- Ctrl+D[/green]: Send message
-            [green]- Ctrl+V[/green]: Paste
-            [green]- Ctrl+Z[/green]: Undo
-            [green]- Ctrl+Y[/green]: Redo
-            [green]- Up/Down[/green]: Navigate history
-            """
-        self.console.print(
-            Panel.fit(
-                welcome_text,
+            panel = self._welcome_cache[model] = Panel.fit(
+                self._WELCOME_TEMPLATE.format(model=model),
                 title="[bold red]Welcome[/bold red]",
                 border_style="blue",
                 padding=(1, 2),
             )
-        )
+        self.console.print(panel)
@@ -7,13 +7,27 @@ Supports both interactive menu and command-line argument modes.
 Optimized UI version with better visual feedback and navigation.
 """
 
-import argparse
+import copy
 import json
 import os
+import re
+import signal
+import stat
 import sys
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    # argparse is only needed when arguments are given; see main()
+    import argparse
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when unavailable
+    orjson = None
 
 # ========================
 #       Constants
@@ -22,6 +36,34 @@ CONFIG_DIR = Path.home() / ".claude"
 CONFIG_FILE = CONFIG_DIR / "settings.json"
 CLAUDE_JSON_FILE = Path.home() / ".claude.json"
 
+# Last parse of each JSON file read, keyed by path; entries are tagged with the
+# file's (st_mtime_ns, st_size) at read time
+_json_cache: dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
+# Number forms orjson cannot round-trip: NaN/Infinity (rejected on load and
+# written back as null) and integers past 64 bits (read back as floats).
+# Digit runs this long are rare enough that a false match only costs speed.
+_ORJSON_LOSSY_RE = re.compile(rb"NaN|Infinity|\d{19}")
+
+# Files whose last read needed stdlib json; they are written back with it too
+_stdlib_json_paths: set[Path] = set()
+
+# Matches SGR escape sequences; used to measure visible text width
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Terminal size, cached only while watch_terminal_size() keeps it fresh
+_term_size: Optional[Tuple[int, int]] = None
+_term_size_watched = False
+
+# Valid environment variable name: letter or underscore, then word characters
+_IDENT_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+
+# Colors are only emitted to a terminal, and never when NO_COLOR is set
+_USE_COLOR = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+
+# Shared run of blanks that draw_box slices its right padding from
+_SPACES = ' ' * 256
+
 # Preset Configurations
 PRESETS = {
     "openrouter": {
@@ -65,6 +107,10 @@ PRESETS = {
     },
 }
 
+# Menu position -> preset, for the numbered preset and base URL menus
+_PRESET_KEYS: Tuple[str, ...] = tuple(PRESETS)
+_PRESET_VALUES: Tuple[dict, ...] = tuple(PRESETS.values())
+
 # Environment Variable Descriptions
 ENV_VARS_INFO = {
     "ANTHROPIC_BASE_URL": "API Base URL",
@@ -113,6 +159,11 @@ class Colors:
     MUTED = DIM
 
 
+# Drop-in replacement for Colors with every code blanked; disable_colors()
+# rebinds Colors to it
+_PLAIN_COLORS = SimpleNamespace(**{name: '' for name in vars(Colors) if not name.startswith('_')})
+
+
 class Box:
     """Box drawing characters for UI"""
     # Single line
@@ -149,13 +200,29 @@ class UI:
     @staticmethod
     def get_terminal_size() -> Tuple[int, int]:
         """Get terminal size (columns, rows)"""
+        global _term_size
+        if _term_size is not None:
+            return _term_size
         size = shutil.get_terminal_size((80, 24))
+        if _term_size_watched:
+            _term_size = (size.columns, size.lines)
         return size.columns, size.lines
     
     @staticmethod
-    def clear_screen() -> None:
-        """Clear terminal screen"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+    def clear_screen(flush: bool = True) -> None:
+        """Clear terminal screen
+        
+        Pass flush=False when a frame is written right after, so the clear goes
+        out in the same write as the frame instead of on its own.
+        """
+        if os.name == 'nt' and not os.environ.get('WT_SESSION'):
+            # Legacy Windows consoles may not interpret VT escape sequences
+            os.system('cls')
+            return
+        # Erase display and scrollback, then home the cursor
+        sys.stdout.write('\033[2J\033[3J\033[H')
+        if flush:
+            sys.stdout.flush()
     
     @staticmethod
     def center_text(text: str, width: int) -> str:
@@ -191,10 +258,10 @@ class UI:
         # Content
         for line in content:
             # Strip ANSI codes for length calculation
-            import re
-            clean_line = re.sub(r'\033\[[0-9;]*m', '', line)
+            clean_line = _ANSI_RE.sub('', line)
             padding = inner_width - len(clean_line)
-            lines.append(f"{v}{line}{' ' * padding}{v}")
+            spaces = _SPACES[:padding] if 0 < padding <= 256 else ' ' * padding
+            lines.append(f"{v}{line}{spaces}{v}")
         
         # Bottom border
         lines.append(f"{bl}{h * inner_width}{br}")
@@ -209,18 +276,10 @@ class UI:
     @staticmethod
     def format_menu_item(number: str, text: str, hint: str = "", selected: bool = False) -> str:
         """Format a menu item"""
-        if selected:
-            prefix = f"{Colors.ACCENT}{Colors.BOLD}▶{Colors.END}"
-        else:
-            prefix = " "
-        
-        num_display = f"{Colors.ACCENT}{Colors.BOLD}[{number}]{Colors.END}"
-        text_display = f"{Colors.WHITE}{text}{Colors.END}"
-        
+        prefix = _MENU_FMT["selected"] if selected else " "
         if hint:
-            hint_display = f"{Colors.DIM}  {hint}{Colors.END}"
-            return f" {prefix} {num_display} {text_display}{hint_display}"
-        return f" {prefix} {num_display} {text_display}"
+            return _MENU_FMT["item_hint"].format(prefix, number, text, hint)
+        return _MENU_FMT["item"].format(prefix, number, text)
     
     @staticmethod
     def prompt(text: str, default: str = "") -> str:
@@ -244,21 +303,27 @@ class UI:
         except EOFError:
             return default
     
+    @staticmethod
+    def write_lines(lines: list[str]) -> None:
+        """Write a block of lines to stdout in a single call and flush once"""
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+    
     @staticmethod
     def print_success(msg: str) -> None:
-        print(f"\n {Colors.SUCCESS}✓{Colors.END} {msg}")
+        sys.stdout.write(f"\n {Colors.SUCCESS}✓{Colors.END} {msg}\n")
     
     @staticmethod
     def print_error(msg: str) -> None:
-        print(f"\n {Colors.ERROR}✗{Colors.END} {msg}", file=sys.stderr)
+        sys.stderr.write(f"\n {Colors.ERROR}✗{Colors.END} {msg}\n")
     
     @staticmethod
     def print_warning(msg: str) -> None:
-        print(f"\n {Colors.WARNING}!{Colors.END} {msg}")
+        sys.stdout.write(f"\n {Colors.WARNING}!{Colors.END} {msg}\n")
     
     @staticmethod
     def print_info(msg: str) -> None:
-        print(f"\n {Colors.INFO}ℹ{Colors.END} {msg}")
+        sys.stdout.write(f"\n {Colors.INFO}ℹ{Colors.END} {msg}\n")
     
     @staticmethod
     def wait_for_key(msg: str = "Press Enter to continue...") -> None:
@@ -269,6 +334,73 @@ class UI:
             pass
 
 
+# Menu item templates and the static parts of every menu screen, with the
+# current Colors baked in; rebuilt whenever the color constants change
+_MENU_FMT: dict[str, str] = {}
+_MENU_TEXT: dict[str, str] = {}
+
+
+def build_menu_formats() -> None:
+    """(Re)build the menu item templates and static menu screens from the current Colors"""
+    item = f" {{}} {Colors.ACCENT}{Colors.BOLD}[{{}}]{Colors.END} {Colors.WHITE}{{}}{Colors.END}"
+    _MENU_FMT["selected"] = f"{Colors.ACCENT}{Colors.BOLD}▶{Colors.END}"
+    _MENU_FMT["item"] = item
+    _MENU_FMT["item_hint"] = f"{item}{Colors.DIM}  {{}}{Colors.END}"
+    
+    separator = UI.draw_separator(width=50)
+    
+    def screen(name: str, title: str, body: list[str]) -> None:
+        _MENU_TEXT[name] = '\n'.join([f"\n {Colors.BOLD}{title}{Colors.END}", separator, *body])
+    
+    def section(label: str) -> list[str]:
+        return ["", f" {Colors.DIM}{label}{Colors.END}", ""]
+    
+    presets, base_urls = [""], section("Common URLs:")
+    for i, preset in enumerate(_PRESET_VALUES, 1):
+        entry = UI.format_menu_item(str(i), preset['name'])
+        presets += [
+            entry,
+            f"      {Colors.DIM}{preset['description']}{Colors.END}",
+            f"      {Colors.DIM}URL: {preset['base_url']}{Colors.END}",
+            "",
+        ]
+        base_urls += [entry, f"      {Colors.DIM}{preset['base_url']}{Colors.END}", ""]
+    presets += [UI.format_menu_item("0", "Back"), ""]
+    base_urls += [UI.format_menu_item("c", "Custom URL"), UI.format_menu_item("0", "Back"), ""]
+    
+    env_vars = section("Common variables:")
+    for key, desc in ENV_VARS_INFO.items():
+        env_vars += [f"   {Colors.CYAN}{key}{Colors.END}", f"   {Colors.DIM}└─ {desc}{Colors.END}", ""]
+    
+    screen("view_config", "📋 Current Configuration", [])
+    screen("apply_preset", "⚡ Quick Setup - Select Preset", presets)
+    screen("set_env", "🔧 Set Environment Variable", env_vars)
+    screen("delete_env", "🗑️  Delete Environment Variable", [""])
+    screen("set_api_key", "🔑 Set API Key", [
+        *section("Authentication Method:"),
+        UI.format_menu_item("1", "ANTHROPIC_AUTH_TOKEN", "Bearer Token ★"),
+        UI.format_menu_item("2", "ANTHROPIC_API_KEY", "X-Api-Key"),
+        "",
+        UI.format_menu_item("0", "Back"),
+        "",
+    ])
+    screen("set_base_url", "🌐 Set Base URL", base_urls)
+    screen("set_model", "🤖 Set Model", [
+        *section("Model Variables:"),
+        UI.format_menu_item("1", "ANTHROPIC_MODEL", "Default Model"),
+        UI.format_menu_item("2", "ANTHROPIC_DEFAULT_SONNET_MODEL", "Sonnet Tier"),
+        UI.format_menu_item("3", "ANTHROPIC_DEFAULT_OPUS_MODEL", "Opus Tier"),
+        UI.format_menu_item("4", "ANTHROPIC_DEFAULT_HAIKU_MODEL", "Haiku Tier"),
+        UI.format_menu_item("5", "Custom", "Enter env var name"),
+        "",
+        UI.format_menu_item("0", "Back"),
+        "",
+    ])
+
+
+build_menu_formats()
+
+
 # ========================
 #       Helper Functions
 # ========================
@@ -277,24 +409,112 @@ def ensure_config_dir() -> None:
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def read_json_file(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it can read the file losslessly"""
+    raw = path.read_bytes()
+    if orjson is not None and not _ORJSON_LOSSY_RE.search(raw):
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            _stdlib_json_paths.discard(path)
+            return data
+    data = json.loads(raw)
+    _stdlib_json_paths.add(path)
+    return data
+
+
+def encode_json(data: Any, source: Optional[Path] = None) -> bytes:
+    """Serialize data as 2-space indented UTF-8 JSON, using orjson when it is installed
+    
+    source is the file the data was read from; files orjson could not read
+    losslessly are serialized with stdlib json.
+    """
+    if orjson is not None and source not in _stdlib_json_paths:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def dumps_json(data: Any, source: Optional[Path] = None) -> str:
+    """Serialize data as 2-space indented JSON text"""
+    return encode_json(data, source).decode("utf-8")
+
+
+def write_json_file(path: Path, data: Any) -> None:
+    """Atomically write data as indented JSON, using orjson when it is installed"""
+    payload = encode_json(data, path)
+    
+    # Replace the file a symlink points at (e.g. a dotfiles checkout), not the
+    # link itself, and keep its permissions; a new file gets the umask default
+    target = os.path.realpath(path)
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    
+    # Write the whole payload to a uniquely named sibling temp file, then
+    # rename it over the target so an interrupted save never leaves a
+    # truncated settings file and concurrent saves cannot interleave
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(target) + ".", suffix=".tmp", dir=os.path.dirname(target)
+    )
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # By path rather than os.fchmod, which Windows lacks before Python 3.13
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        _json_cache.pop(path, None)
+
+
+def read_json_cached(path: Path) -> Any:
+    """Parse a JSON file, reusing the last parse while the file is unchanged
+    
+    Raises OSError if the file cannot be stat'ed. Callers mutate the result,
+    so a copy of the cached value is returned.
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        cached = _json_cache[path] = (key, read_json_file(path))
+    return copy.deepcopy(cached[1])
+
+
 def load_config() -> dict:
     """Load configuration file"""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            UI.print_warning("Config file format error, creating new configuration.")
-            return {}
-    return {}
+    try:
+        return read_json_cached(CONFIG_FILE)
+    except OSError:
+        return {}
+    except json.JSONDecodeError:
+        UI.print_warning("Config file format error, creating new configuration.")
+        return {}
 
 
 def save_config(config: dict) -> bool:
     """Save configuration file"""
     try:
         ensure_config_dir()
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        write_json_file(CONFIG_FILE, config)
         return True
     except Exception as e:
         UI.print_error(f"Failed to save config: {e}")
@@ -303,20 +523,16 @@ def save_config(config: dict) -> bool:
 
 def load_claude_json() -> dict:
     """Load ~/.claude.json file"""
-    if CLAUDE_JSON_FILE.exists():
-        try:
-            with open(CLAUDE_JSON_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-    return {}
+    try:
+        return read_json_cached(CLAUDE_JSON_FILE)
+    except (OSError, json.JSONDecodeError):
+        return {}
 
 
 def save_claude_json(config: dict) -> bool:
     """Save ~/.claude.json file"""
     try:
-        with open(CLAUDE_JSON_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        write_json_file(CLAUDE_JSON_FILE, config)
         return True
     except Exception as e:
         UI.print_error(f"Failed to save ~/.claude.json: {e}")
@@ -333,9 +549,13 @@ def get_env_value(config: dict, key: str) -> Optional[str]:
 
 def set_env_value(config: dict, key: str, value: str) -> dict:
     """Set environment variable value"""
-    if "env" not in config:
-        config["env"] = {}
-    config["env"][key] = value
+    config.setdefault("env", {})[key] = value
+    return config
+
+
+def set_env_values(config: dict, items: Iterable[Tuple[str, str]]) -> dict:
+    """Set several environment variables in one pass"""
+    config.setdefault("env", {}).update(items)
     return config
 
 
@@ -346,6 +566,15 @@ def delete_env_value(config: dict, key: str) -> dict:
     return config
 
 
+def delete_env_values(config: dict, keys: Iterable[str]) -> dict:
+    """Delete several environment variables in one pass"""
+    env = config.get("env")
+    if env:
+        for key in keys:
+            env.pop(key, None)
+    return config
+
+
 def mask_sensitive(key: str, value: str) -> str:
     """Mask sensitive values for display"""
     if "TOKEN" in key or "KEY" in key:
@@ -378,8 +607,7 @@ def display_config(config: dict) -> None:
     if content and content[-1] == "":
         content.pop()
     
-    print()
-    print(UI.draw_box("Current Configuration", content, width=70))
+    sys.stdout.write(f"\n{UI.draw_box('Current Configuration', content, width=70)}\n")
 
 
 def apply_preset(config: dict, preset_name: str, api_key: Optional[str] = None) -> dict:
@@ -389,16 +617,12 @@ def apply_preset(config: dict, preset_name: str, api_key: Optional[str] = None)
         return config
     
     preset = PRESETS[preset_name]
-    if "env" not in config:
-        config["env"] = {}
-    
-    # Apply preset environment variables
-    for key, value in preset["env"].items():
-        config["env"][key] = value
-    
-    # Set API Key if provided
-    if api_key:
-        config["env"]["ANTHROPIC_AUTH_TOKEN"] = api_key
+    # Merge existing, preset and API key values in a single dict build
+    config["env"] = {
+        **config.get("env", {}),
+        **preset["env"],
+        **({"ANTHROPIC_AUTH_TOKEN": api_key} if api_key else {}),
+    }
     
     UI.print_success(f"Applied preset: {preset['name']}")
     return config
@@ -415,9 +639,12 @@ def complete_onboarding() -> None:
 # ========================
 #       Interactive Menu
 # ========================
-def draw_header() -> None:
-    """Draw the application header"""
-    width, _ = UI.get_terminal_size()
+# Rendered main menu frames keyed by (terminal width, colors enabled)
+_MENU_CACHE: dict[Tuple[int, bool], str] = {}
+
+
+def render_header(width: int) -> list[str]:
+    """Render the application header for the given terminal width"""
     box_width = min(70, width - 4)
     
     title_lines = [
@@ -428,66 +655,62 @@ def draw_header() -> None:
         "",
     ]
     
-    print(UI.draw_box("", title_lines, width=box_width, style="double"))
-
-
-def draw_main_menu() -> None:
-    """Draw the main menu"""
-    print()
-    print(f" {Colors.BOLD}Main Menu{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    print(UI.format_menu_item("1", "View Current Config", "Show all settings"))
-    print(UI.format_menu_item("2", "Use Preset Config", "Quick setup ★"))
-    print(UI.format_menu_item("3", "Set Environment Variable"))
-    print(UI.format_menu_item("4", "Delete Environment Variable"))
-    print()
-    print(f" {Colors.DIM}── Quick Settings ──{Colors.END}")
-    print()
-    print(UI.format_menu_item("5", "Set API Key"))
-    print(UI.format_menu_item("6", "Set Base URL"))
-    print(UI.format_menu_item("7", "Set Model"))
-    print()
-    print(f" {Colors.DIM}── Other ──{Colors.END}")
-    print()
-    print(UI.format_menu_item("8", "Complete Onboarding"))
-    print(UI.format_menu_item("9", "Reset Configuration", "⚠ Danger"))
-    print(UI.format_menu_item("0", "Exit", "Ctrl+C"))
-    print()
+    return [UI.draw_box("", title_lines, width=box_width, style="double")]
+
+
+def render_main_menu() -> list[str]:
+    """Render the main menu"""
+    return [
+        "",
+        f" {Colors.BOLD}Main Menu{Colors.END}",
+        UI.draw_separator(width=50),
+        "",
+        UI.format_menu_item("1", "View Current Config", "Show all settings"),
+        UI.format_menu_item("2", "Use Preset Config", "Quick setup ★"),
+        UI.format_menu_item("3", "Set Environment Variable"),
+        UI.format_menu_item("4", "Delete Environment Variable"),
+        "",
+        f" {Colors.DIM}── Quick Settings ──{Colors.END}",
+        "",
+        UI.format_menu_item("5", "Set API Key"),
+        UI.format_menu_item("6", "Set Base URL"),
+        UI.format_menu_item("7", "Set Model"),
+        "",
+        f" {Colors.DIM}── Other ──{Colors.END}",
+        "",
+        UI.format_menu_item("8", "Complete Onboarding"),
+        UI.format_menu_item("9", "Reset Configuration", "⚠ Danger"),
+        UI.format_menu_item("0", "Exit", "Ctrl+C"),
+        "",
+    ]
+
+
+def draw_main_screen() -> None:
+    """Draw the header and main menu, reusing the last frame rendered at this width"""
+    width, _ = UI.get_terminal_size()
+    key = (width, bool(Colors.END))
+    frame = _MENU_CACHE.get(key)
+    if frame is None:
+        frame = _MENU_CACHE[key] = '\n'.join(render_header(width) + render_main_menu()) + '\n'
+    sys.stdout.write(frame)
+    sys.stdout.flush()
 
 
 def interactive_menu() -> None:
     """Interactive Configuration Menu"""
     while True:
-        UI.clear_screen()
-        draw_header()
-        draw_main_menu()
+        UI.clear_screen(flush=False)
+        draw_main_screen()
         
         choice = UI.prompt("Select an option", "0")
         
-        if choice == "0":
-            UI.clear_screen()
+        action = _MENU_ACTIONS.get(choice)
+        if action is not None:
+            action()
+        elif choice == "0":
+            UI.clear_screen(flush=False)
             print(f"\n {Colors.SUCCESS}Goodbye! 👋{Colors.END}\n")
             break
-        elif choice == "1":
-            menu_view_config()
-        elif choice == "2":
-            menu_apply_preset()
-        elif choice == "3":
-            menu_set_env()
-        elif choice == "4":
-            menu_delete_env()
-        elif choice == "5":
-            menu_set_api_key()
-        elif choice == "6":
-            menu_set_base_url()
-        elif choice == "7":
-            menu_set_model()
-        elif choice == "8":
-            complete_onboarding()
-            UI.wait_for_key()
-        elif choice == "9":
-            menu_reset_config()
         else:
             UI.print_error("Invalid selection, please try again.")
             UI.wait_for_key()
@@ -495,9 +718,8 @@ def interactive_menu() -> None:
 
 def menu_view_config() -> None:
     """Menu: View Configuration"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}📋 Current Configuration{Colors.END}")
-    print(UI.draw_separator(width=50))
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["view_config"]])
     
     config = load_config()
     display_config(config)
@@ -507,20 +729,8 @@ def menu_view_config() -> None:
 
 def menu_apply_preset() -> None:
     """Menu: Apply Preset Configuration"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}⚡ Quick Setup - Select Preset{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    
-    presets_list = list(PRESETS.items())
-    for i, (key, preset) in enumerate(presets_list, 1):
-        print(UI.format_menu_item(str(i), preset['name']))
-        print(f"      {Colors.DIM}{preset['description']}{Colors.END}")
-        print(f"      {Colors.DIM}URL: {preset['base_url']}{Colors.END}")
-        print()
-    
-    print(UI.format_menu_item("0", "Back"))
-    print()
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["apply_preset"]])
     
     choice = UI.prompt("Select a preset", "0")
     
@@ -529,12 +739,11 @@ def menu_apply_preset() -> None:
     
     try:
         idx = int(choice) - 1
-        if 0 <= idx < len(presets_list):
-            preset_key = presets_list[idx][0]
-            preset_name = presets_list[idx][1]['name']
+        if 0 <= idx < len(_PRESET_KEYS):
+            preset_key = _PRESET_KEYS[idx]
+            preset_name = _PRESET_VALUES[idx]['name']
             
-            print()
-            print(f" {Colors.INFO}ℹ{Colors.END} Setting up {Colors.ACCENT}{preset_name}{Colors.END}")
+            sys.stdout.write(f"\n {Colors.INFO}ℹ{Colors.END} Setting up {Colors.ACCENT}{preset_name}{Colors.END}\n")
             
             # Ask for API Key
             api_key = UI.prompt("Enter API Key (leave blank to skip)")
@@ -560,17 +769,8 @@ def menu_apply_preset() -> None:
 
 def menu_set_env() -> None:
     """Menu: Set Environment Variable"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}🔧 Set Environment Variable{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    print(f" {Colors.DIM}Common variables:{Colors.END}")
-    print()
-    
-    for key, desc in ENV_VARS_INFO.items():
-        print(f"   {Colors.CYAN}{key}{Colors.END}")
-        print(f"   {Colors.DIM}└─ {desc}{Colors.END}")
-        print()
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["set_env"]])
     
     key = UI.prompt("Variable name (or 0 to cancel)")
     if not key or key == "0":
@@ -599,20 +799,19 @@ def menu_delete_env() -> None:
         UI.wait_for_key()
         return
     
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}🗑️  Delete Environment Variable{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
+    UI.clear_screen(flush=False)
+    lines = [_MENU_TEXT["delete_env"]]
     
     keys = list(env.keys())
     for i, key in enumerate(keys, 1):
         value = mask_sensitive(key, env[key])
-        print(UI.format_menu_item(str(i), key))
-        print(f"      {Colors.DIM}= {value}{Colors.END}")
-        print()
+        lines.append(UI.format_menu_item(str(i), key))
+        lines.append(f"      {Colors.DIM}= {value}{Colors.END}")
+        lines.append("")
     
-    print(UI.format_menu_item("0", "Back"))
-    print()
+    lines.append(UI.format_menu_item("0", "Back"))
+    lines.append("")
+    UI.write_lines(lines)
     
     choice = UI.prompt("Select variable to delete", "0")
     
@@ -637,17 +836,8 @@ def menu_delete_env() -> None:
 
 def menu_set_api_key() -> None:
     """Menu: Set API Key"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}🔑 Set API Key{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    print(f" {Colors.DIM}Authentication Method:{Colors.END}")
-    print()
-    print(UI.format_menu_item("1", "ANTHROPIC_AUTH_TOKEN", "Bearer Token ★"))
-    print(UI.format_menu_item("2", "ANTHROPIC_API_KEY", "X-Api-Key"))
-    print()
-    print(UI.format_menu_item("0", "Back"))
-    print()
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["set_api_key"]])
     
     choice = UI.prompt("Select auth method", "1")
     
@@ -677,36 +867,21 @@ def menu_set_api_key() -> None:
 
 def menu_set_base_url() -> None:
     """Menu: Set Base URL"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}🌐 Set Base URL{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    print(f" {Colors.DIM}Common URLs:{Colors.END}")
-    print()
-    
-    for i, (key, preset) in enumerate(PRESETS.items(), 1):
-        print(UI.format_menu_item(str(i), preset['name']))
-        print(f"      {Colors.DIM}{preset['base_url']}{Colors.END}")
-        print()
-    
-    print(UI.format_menu_item("c", "Custom URL"))
-    print(UI.format_menu_item("0", "Back"))
-    print()
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["set_base_url"]])
     
     choice = UI.prompt("Select or enter 'c' for custom", "0")
     
     if choice == "0":
         return
     
-    preset_list = list(PRESETS.values())
-    
     if choice == "c":
         url = UI.prompt("Enter custom Base URL")
     else:
         try:
             idx = int(choice) - 1
-            if 0 <= idx < len(preset_list):
-                url = preset_list[idx]['base_url']
+            if 0 <= idx < len(_PRESET_VALUES):
+                url = _PRESET_VALUES[idx]['base_url']
             else:
                 UI.print_error("Invalid selection")
                 UI.wait_for_key()
@@ -730,20 +905,8 @@ def menu_set_base_url() -> None:
 
 def menu_set_model() -> None:
     """Menu: Set Model"""
-    UI.clear_screen()
-    print(f"\n {Colors.BOLD}🤖 Set Model{Colors.END}")
-    print(UI.draw_separator(width=50))
-    print()
-    print(f" {Colors.DIM}Model Variables:{Colors.END}")
-    print()
-    print(UI.format_menu_item("1", "ANTHROPIC_MODEL", "Default Model"))
-    print(UI.format_menu_item("2", "ANTHROPIC_DEFAULT_SONNET_MODEL", "Sonnet Tier"))
-    print(UI.format_menu_item("3", "ANTHROPIC_DEFAULT_OPUS_MODEL", "Opus Tier"))
-    print(UI.format_menu_item("4", "ANTHROPIC_DEFAULT_HAIKU_MODEL", "Haiku Tier"))
-    print(UI.format_menu_item("5", "Custom", "Enter env var name"))
-    print()
-    print(UI.format_menu_item("0", "Back"))
-    print()
+    UI.clear_screen(flush=False)
+    UI.write_lines([_MENU_TEXT["set_model"]])
 
     choice = UI.prompt("Select model variable", "0")
 
@@ -765,9 +928,7 @@ def menu_set_model() -> None:
             return
 
         var_name = var_name.upper()
-        if not (var_name[0].isalpha() or var_name[0] == "_") or not all(
-            ch.isalnum() or ch == "_" for ch in var_name
-        ):
+        if not _IDENT_RE.match(var_name):
             UI.print_error("Invalid variable name (use letters/numbers/underscore, start with a letter/_).")
             UI.wait_for_key()
             return
@@ -793,8 +954,7 @@ def menu_set_model() -> None:
 
 def menu_reset_config() -> None:
     """Menu: Reset Configuration"""
-    print()
-    print(f" {Colors.WARNING}⚠ Warning: This will delete all configuration!{Colors.END}")
+    sys.stdout.write(f"\n {Colors.WARNING}⚠ Warning: This will delete all configuration!{Colors.END}\n")
     
     if UI.confirm("Are you sure you want to reset all configurations?", default=False):
         if save_config({}):
@@ -805,11 +965,49 @@ def menu_reset_config() -> None:
     UI.wait_for_key()
 
 
+def menu_complete_onboarding() -> None:
+    """Menu: Complete Onboarding"""
+    complete_onboarding()
+    UI.wait_for_key()
+
+
+# Options that select a CLI action; with none of them given, main() opens the menu
+_CLI_ACTION_ARGS = (
+    "preset", "baseurl", "key", "model",
+    "sonnet_model", "opus_model", "haiku_model",
+    "timeout", "set", "delete", "get",
+    "list", "reset", "onboarding",
+)
+
+# Options that edit settings.json in place; run_cli snapshots the config only for these
+_CLI_MUTATING_ARGS = (
+    "preset", "baseurl", "key", "model",
+    "sonnet_model", "opus_model", "haiku_model",
+    "timeout", "set", "delete",
+)
+
+
+# Main menu choice -> handler
+_MENU_ACTIONS: dict[str, Callable[[], None]] = {
+    "1": menu_view_config,
+    "2": menu_apply_preset,
+    "3": menu_set_env,
+    "4": menu_delete_env,
+    "5": menu_set_api_key,
+    "6": menu_set_base_url,
+    "7": menu_set_model,
+    "8": menu_complete_onboarding,
+    "9": menu_reset_config,
+}
+
+
 # ========================
 #       CLI Argument Handler
 # ========================
-def create_parser() -> argparse.ArgumentParser:
+def create_parser() -> "argparse.ArgumentParser":
     """Create Command Line Argument Parser"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Claude Code Configuration Manager",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -936,12 +1134,14 @@ def create_parser() -> argparse.ArgumentParser:
 
 def disable_colors() -> None:
     """Disable all colors"""
-    for attr in dir(Colors):
-        if not attr.startswith('_'):
-            setattr(Colors, attr, '')
+    global Colors
+    if Colors is _PLAIN_COLORS:
+        return
+    Colors = _PLAIN_COLORS
+    build_menu_formats()
 
 
-def run_cli(args: argparse.Namespace) -> int:
+def run_cli(args: "argparse.Namespace") -> int:
     """Run CLI Mode"""
     if args.no_color:
         disable_colors()
@@ -972,77 +1172,83 @@ def run_cli(args: argparse.Namespace) -> int:
     # List Config
     if args.list:
         if args.json:
-            print(json.dumps(config, indent=2, ensure_ascii=False))
+            print(dumps_json(config, CONFIG_FILE))
         else:
             display_config(config)
         return 0
     
+    # Snapshot only when some option may edit the config in place
+    original = (
+        copy.deepcopy(config)
+        if any(getattr(args, name) for name in _CLI_MUTATING_ARGS)
+        else None
+    )
+    
     # Apply Preset
     if args.preset:
         config = apply_preset(config, args.preset, args.key)
         modified = True
-    elif args.key:
-        config = set_env_value(config, "ANTHROPIC_AUTH_TOKEN", args.key)
-        modified = True
+    
+    # Collect every individual value first and apply them in one pass
+    updates = []
+    if args.key and not args.preset:
+        updates.append(("ANTHROPIC_AUTH_TOKEN", args.key))
     
     # Set Base URL
     if args.baseurl:
-        config = set_env_value(config, "ANTHROPIC_BASE_URL", args.baseurl)
-        modified = True
+        updates.append(("ANTHROPIC_BASE_URL", args.baseurl))
     
     # Set Models
     if args.model:
-        config = set_env_value(config, "ANTHROPIC_MODEL", args.model)
-        modified = True
-    
+        updates.append(("ANTHROPIC_MODEL", args.model))
     if args.sonnet_model:
-        config = set_env_value(config, "ANTHROPIC_DEFAULT_SONNET_MODEL", args.sonnet_model)
-        modified = True
-    
+        updates.append(("ANTHROPIC_DEFAULT_SONNET_MODEL", args.sonnet_model))
     if args.opus_model:
-        config = set_env_value(config, "ANTHROPIC_DEFAULT_OPUS_MODEL", args.opus_model)
-        modified = True
-    
+        updates.append(("ANTHROPIC_DEFAULT_OPUS_MODEL", args.opus_model))
     if args.haiku_model:
-        config = set_env_value(config, "ANTHROPIC_DEFAULT_HAIKU_MODEL", args.haiku_model)
-        modified = True
+        updates.append(("ANTHROPIC_DEFAULT_HAIKU_MODEL", args.haiku_model))
     
     # Set Timeout
     if args.timeout:
-        config = set_env_value(config, "API_TIMEOUT_MS", str(args.timeout))
-        modified = True
+        updates.append(("API_TIMEOUT_MS", str(args.timeout)))
     
     # Set Custom Environment Variables
     if args.set:
         for item in args.set:
             if "=" in item:
                 key, value = item.split("=", 1)
-                config = set_env_value(config, key.strip(), value.strip())
-                modified = True
+                updates.append((key.strip(), value.strip()))
             else:
                 UI.print_error(f"Invalid format: {item} (Should be KEY=VALUE)")
     
+    if updates:
+        config = set_env_values(config, updates)
+        modified = True
+    
     # Delete Environment Variables
     if args.delete:
+        config = delete_env_values(config, args.delete)
+        modified = True
         for key in args.delete:
-            config = delete_env_value(config, key)
-            modified = True
             UI.print_info(f"Deleted {key}")
     
     # Complete Onboarding
     if args.onboarding:
         complete_onboarding()
     
-    # Save Config
+    # Save Config, skipping the rewrite when the options changed nothing
     if modified:
-        if save_config(config):
+        if config == original:
+            UI.print_info("Configuration already up to date")
+        elif save_config(config):
             UI.print_success("Configuration saved!")
-            if args.json:
-                print(json.dumps(config, indent=2, ensure_ascii=False))
-            else:
-                display_config(config)
-            return 0
-        return 1
+        else:
+            return 1
+        if args.json:
+            print(dumps_json(config, CONFIG_FILE))
+        else:
+            display_config(config)
+        return 0
     
     return 0
 
@@ -1050,30 +1256,80 @@ def run_cli(args: argparse.Namespace) -> int:
 # ========================
 #       Main Function
 # ========================
+def watch_terminal_size() -> None:
+    """Cache the terminal size and drop the cached value on SIGWINCH"""
+    global _term_size_watched
+    sigwinch = getattr(signal, "SIGWINCH", None)
+    if sigwinch is None or _term_size_watched:
+        return
+    previous = signal.getsignal(sigwinch)
+    
+    def on_resize(signum, frame):
+        global _term_size
+        _term_size = None
+        if callable(previous):
+            previous(signum, frame)
+    
+    try:
+        signal.signal(sigwinch, on_resize)
+    except ValueError:
+        # Not on the main thread; keep querying the size every time
+        return
+    _term_size_watched = True
+
+
+def run_interactive() -> int:
+    """Run the interactive menu until the user exits"""
+    watch_terminal_size()
+    try:
+        interactive_menu()
+        return 0
+    except KeyboardInterrupt:
+        UI.clear_screen(flush=False)
+        print(f"\n {Colors.INFO}Cancelled{Colors.END}\n")
+        return 0
+
+
+def run_fast_path(argv: list[str]) -> Optional[int]:
+    """Answer `--list --json` and `--get KEY --json` without building the parser
+    
+    Returns None when argv is anything else, or when the full CLI path is
+    needed to report an error.
+    """
+    if len(argv) == 2 and set(argv) in ({"--list", "--json"}, {"-l", "--json"}):
+        print(dumps_json(load_config(), CONFIG_FILE))
+        return 0
+    
+    if len(argv) == 3 and argv[0] in ("--get", "-g") and argv[2] == "--json" and not argv[1].startswith("-"):
+        value = get_env_value(load_config(), argv[1])
+        if value:
+            print(json.dumps({argv[1]: value}))
+            return 0
+    
+    return None
+
+
 def main() -> int:
     """Main Function"""
+    # Decide on colors before anything is rendered, including the --help epilog
+    if not _USE_COLOR or "--no-color" in sys.argv[1:]:
+        disable_colors()
+    
+    # A bare invocation always opens the menu, so skip argparse entirely
+    if len(sys.argv) == 1:
+        return run_interactive()
+    
+    # Scripted queries that argparse would not change the answer to
+    result = run_fast_path(sys.argv[1:])
+    if result is not None:
+        return result
+    
     parser = create_parser()
     args = parser.parse_args()
     
-    if args.no_color:
-        disable_colors()
-    
     # If no arguments or forced interactive mode, enter interactive menu
-    if args.interactive or (
-        not any([
-            args.preset, args.baseurl, args.key, args.model,
-            args.sonnet_model, args.opus_model, args.haiku_model,
-            args.timeout, args.set, args.delete, args.get,
-            args.list, args.reset, args.onboarding
-        ])
-    ):
-        try:
-            interactive_menu()
-            return 0
-        except KeyboardInterrupt:
-            UI.clear_screen()
-            print(f"\n {Colors.INFO}Cancelled{Colors.END}\n")
-            return 0
+    if args.interactive or not any(getattr(args, name) for name in _CLI_ACTION_ARGS):
+        return run_interactive()
     else:
         return run_cli(args)
 
@@ -21,14 +21,21 @@ Dependencies:
 from __future__ import annotations
 
 import argparse
-import copy
 import datetime as _dt
+import importlib
 import json
+import math
 import os
 import re
+import shutil
 import sys
 import tempfile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when unavailable
+    orjson = None
 
 DEFAULT_PATH = os.path.expanduser("~/.claude-code-router/config.json")
 
@@ -62,91 +69,152 @@ def _check_inquirer():
 # Relaxed JSON (JSON5-ish) loader
 # ----------------------------
 
-def _strip_json5_comments(text: str) -> str:
+def _relax_json5(text: str) -> str:
     """
-    Remove // line comments and /* */ block comments, without touching strings.
-    Simple state machine.
+    Remove // line comments, /* */ block comments and trailing commas before
+    } or ], without touching strings. Jumps between '/', ',', quote characters
+    and comment/string ends with str.find, copying the text in between as
+    whole slices.
     """
     out = []
     i = 0
     n = len(text)
-    in_str = False
-    str_quote = ""
-    escape = False
+    find = text.find
+    # Index in out of the last "," seen, until something other than
+    # whitespace or a comment shows whether it is a trailing comma
+    pending_comma = None
 
     while i < n:
-        ch = text[i]
-
-        if in_str:
-            out.append(ch)
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == str_quote:
-                in_str = False
-            i += 1
-            continue
-
-        # not in string
-        if ch in ("'", '"'):
-            in_str = True
-            str_quote = ch
-            out.append(ch)
-            i += 1
+        # Nearest '/', ',', '"' or "'" at or after i
+        j = n
+        for special in ("/", ",", '"', "'"):
+            k = find(special, i, j)
+            if k != -1:
+                j = k
+
+        if j > i:
+            chunk = text[i:j]
+            if pending_comma is not None:
+                head = chunk.lstrip()
+                if head:
+                    if head[0] in "}]":
+                        out[pending_comma] = ""
+                    pending_comma = None
+            out.append(chunk)
+        if j == n:
+            break
+
+        ch = text[j]
+        if ch == ",":
+            out.append(",")
+            pending_comma = len(out) - 1
+            i = j + 1
             continue
 
-        # line comment //
-        if ch == "/" and i + 1 < n and text[i + 1] == "/":
-            i += 2
-            while i < n and text[i] not in ("\n", "\r"):
-                i += 1
-            continue
-
-        # block comment /* ... */
-        if ch == "/" and i + 1 < n and text[i + 1] == "*":
-            i += 2
-            while i + 1 < n and not (text[i] == "*" and text[i + 1] == "/"):
-                i += 1
-            i += 2 if i + 1 < n else 0
+        if ch == "/":
+            nxt = text[j + 1:j + 2]
+            if nxt == "/":
+                # line comment: drop up to (not including) the line break
+                end = n
+                for eol in ("\n", "\r"):
+                    k = find(eol, j + 2, end)
+                    if k != -1:
+                        end = k
+                i = end
+            elif nxt == "*":
+                # block comment; an unterminated one runs to the end of input
+                end = find("*/", j + 2)
+                i = n if end == -1 else end + 2
+            else:
+                out.append("/")
+                pending_comma = None
+                i = j + 1
             continue
 
-        out.append(ch)
-        i += 1
+        # string: find the closing quote that is not backslash-escaped
+        pending_comma = None
+        k = j + 1
+        while True:
+            k = find(ch, k)
+            if k == -1:
+                k = n
+                break
+            b = k - 1
+            while text[b] == "\\":
+                b -= 1
+            if (k - 1 - b) % 2 == 0:
+                break
+            k += 1
+        out.append(text[j:k + 1])
+        i = k + 1
 
     return "".join(out)
 
 
-_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+# Strict-JSON text of each config by path, with the (st_mtime_ns, st_size)
+# it was read at. Callers mutate what load_config returns, so every hit is
+# re-parsed; the C parsers rebuild the dict faster than a deepcopy would.
+_CFG_CACHE: Dict[str, Tuple[int, int, Union[str, bytes]]] = {}
 
-def _remove_trailing_commas(text: str) -> str:
-    # Remove trailing commas before } or ]
-    # Repeat until stable for nested patterns
-    prev = None
-    cur = text
-    while prev != cur:
-        prev = cur
-        cur = _TRAILING_COMMA_RE.sub(r"\1", cur)
-    return cur
+# Configs orjson could not read losslessly; saving them goes through the
+# stdlib too, so NaN, Infinity and huge integers are written back as read
+_STDLIB_JSON_PATHS: Set[str] = set()
 
 
 def load_config(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
+    try:
+        st = os.stat(path)
+    except OSError:
         return {}
+    cached = _CFG_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return _loads_strict(cached[2])
+
     with open(path, "r", encoding="utf-8") as f:
         raw = f.read()
+    cfg, text = _parse_config_text(raw, path)
+    _CFG_CACHE[path] = (st.st_mtime_ns, st.st_size, text)
+    return cfg
+
+
+# orjson silently reads integers past 64 bits as floats (18446744073709551616
+# comes back as 1.8446744073709552e+19); any 19-digit run could be one
+_LONG_DIGITS_RE = re.compile(r"\d{19}")
+_LONG_DIGITS_BYTES_RE = re.compile(rb"\d{19}")
 
+
+def _loads_strict(text: Union[str, bytes], path: Optional[str] = None) -> Any:
+    # orjson.JSONDecodeError subclasses json's, so text orjson rejects (NaN,
+    # Infinity) still gets a chance with the stdlib; text that orjson would
+    # misread goes straight there
+    long_digits = _LONG_DIGITS_BYTES_RE if isinstance(text, bytes) else _LONG_DIGITS_RE
+    if orjson is not None and not long_digits.search(text):
+        try:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            _STDLIB_JSON_PATHS.discard(path)
+            return data
+    data = json.loads(text)
+    if path is not None:
+        _STDLIB_JSON_PATHS.add(path)
+    return data
+
+
+def _parse_config_text(raw: str, path: str) -> Tuple[Dict[str, Any], str]:
+    """Parse config text, returning the result and the strict JSON it came from."""
     # Try strict JSON first
     try:
-        return json.loads(raw)
+        return _loads_strict(raw, path), raw
     except json.JSONDecodeError:
         pass
 
-    # Relaxed parse
-    cleaned = _strip_json5_comments(raw)
-    cleaned = _remove_trailing_commas(cleaned)
+    # Relaxed parse; a file without any "/" or "," holds neither a comment
+    # nor a trailing comma
+    cleaned = _relax_json5(raw) if "/" in raw or "," in raw else raw
     try:
-        return json.loads(cleaned)
+        cfg = json.loads(cleaned)
     except json.JSONDecodeError as e:
         raise SystemExit(
             f"[ERROR] Failed to parse config file (even after relaxing JSON).\n"
@@ -154,6 +222,8 @@ def load_config(path: str) -> Dict[str, Any]:
             f"Reason: {e}\n"
             f"Tip: Please fix the JSON/JSON5 syntax first."
         )
+    _STDLIB_JSON_PATHS.add(path)
+    return cfg, cleaned
 
 
 def ensure_dir(path: str) -> None:
@@ -167,37 +237,75 @@ def backup_config(path: str) -> Optional[str]:
         return None
     ts = _dt.datetime.now().strftime("%Y%m%d-%H%M%S")
     bkp = os.path.join(os.path.dirname(path), f"config.backup.{ts}.json")
-    with open(path, "rb") as fr, open(bkp, "wb") as fw:
-        fw.write(fr.read())
+    shutil.copyfile(path, bkp)
     return bkp
 
 
+def _has_non_finite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _encode_json(data: Any, indent: Optional[int] = 2, source: Optional[str] = None) -> bytes:
+    # orjson only does 2-space (or no) indentation and 64-bit integers, and
+    # writes NaN/Infinity as null. source is the config data was loaded from;
+    # one the stdlib had to parse is written by the stdlib as well.
+    if orjson is not None and indent in (2, None) and source not in _STDLIB_JSON_PATHS:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            payload = orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # A non-finite float can only hide behind a null in the output
+            if b"null" not in payload or not _has_non_finite(data):
+                return payload
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
 def atomic_write_json(path: str, data: Dict[str, Any], indent: int = 2) -> None:
     ensure_dir(path)
     d = os.path.dirname(path) or "."
+    # Encode before creating the temp file so a bad value cannot leak its fd
+    payload = _encode_json(data, indent, source=path)
     fd, tmp = tempfile.mkstemp(prefix=".config.", suffix=".tmp", dir=d)
+    replaced = False
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
-            f.write("\n")
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.write(b"\n")
         os.replace(tmp, path)
+        replaced = True
+        # What was just written is what the next load_config(path) would parse
+        st = os.stat(path)
+        _CFG_CACHE[path] = (st.st_mtime_ns, st.st_size, payload)
     finally:
-        try:
-            if os.path.exists(tmp):
-                os.remove(tmp)
-        except OSError:
-            pass
+        # Once replaced, tmp is gone; only a failed write leaves it behind
+        if not replaced:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
 
 
 # ----------------------------
 # Utilities
 # ----------------------------
 
+_TRUE_STRS = frozenset(("1", "true", "yes", "y", "on"))
+_FALSE_STRS = frozenset(("0", "false", "no", "n", "off"))
+
+
 def _as_bool(s: str) -> bool:
     ss = s.strip().lower()
-    if ss in ("1", "true", "yes", "y", "on"):
+    if ss in _TRUE_STRS:
         return True
-    if ss in ("0", "false", "no", "n", "off"):
+    if ss in _FALSE_STRS:
         return False
     raise ValueError(f"Not a bool: {s}")
 
@@ -224,13 +332,17 @@ def parse_typed_value(value: str, vtype: str) -> Any:
             return _as_bool(vv)
         except Exception:
             pass
-        try:
-            if re.fullmatch(r"[-+]?\d+", vv):
+        # Only numbers JSON rejects get here ("+42", "007", ".5"); keep
+        # "nan"/"inf" and "1_000" as strings
+        if vv[-1:].isdigit() and "_" not in vv:
+            try:
                 return int(vv)
-            if re.fullmatch(r"[-+]?\d+\.\d+", vv):
+            except ValueError:
+                pass
+            try:
                 return float(vv)
-        except Exception:
-            pass
+            except ValueError:
+                pass
         return value
     raise ValueError(f"Unknown type: {vtype}")
 
@@ -242,22 +354,46 @@ def get_providers(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
     return []
 
 
+# name -> first index for the last Providers list looked up, together with
+# that list and its length so a replaced list is reindexed. The providers_*
+# helpers that add, remove or rename entries drop it.
+_PROVIDER_INDEX: Optional[Tuple[List[Any], int, Dict[str, int]]] = None
+
+
+def _provider_index(providers: List[Any]) -> Dict[str, int]:
+    global _PROVIDER_INDEX
+    cached = _PROVIDER_INDEX
+    if cached is not None and cached[0] is providers and cached[1] == len(providers):
+        return cached[2]
+    index: Dict[str, int] = {}
+    for i, pr in enumerate(providers):
+        if isinstance(pr, dict):
+            pname = pr.get("name")
+            if isinstance(pname, str):
+                index.setdefault(pname, i)
+    _PROVIDER_INDEX = (providers, len(providers), index)
+    return index
+
+
+def _invalidate_provider_index() -> None:
+    global _PROVIDER_INDEX
+    _PROVIDER_INDEX = None
+
+
 def find_provider(cfg: Dict[str, Any], name: str) -> Tuple[int, Optional[Dict[str, Any]]]:
     providers = get_providers(cfg)
-    for i, pr in enumerate(providers):
-        if isinstance(pr, dict) and pr.get("name") == name:
-            return i, pr
+    i = _provider_index(providers).get(name, -1)
+    if i != -1:
+        return i, providers[i]
     return -1, None
 
 
-def _provider_key(provider: Dict[str, Any], snake: str, camel: str) -> str:
-    # Keep existing style if present
-    if snake in provider:
-        return snake
-    if camel in provider:
-        return camel
+def _resolve_keys(provider: Dict[str, Any]) -> Tuple[str, str]:
+    # Keep existing style if present; both field names come from one call
+    url_key = "baseUrl" if "api_base_url" not in provider and "baseUrl" in provider else "api_base_url"
+    key_key = "apiKey" if "api_key" not in provider and "apiKey" in provider else "api_key"
     # default to snake_case (matches README comprehensive example)
-    return snake
+    return url_key, key_key
 
 
 def list_models_by_provider(cfg: Dict[str, Any]) -> Dict[str, List[str]]:
@@ -268,7 +404,8 @@ def list_models_by_provider(cfg: Dict[str, Any]) -> Dict[str, List[str]]:
         name = pr.get("name")
         models = pr.get("models")
         if isinstance(name, str) and isinstance(models, list):
-            out[name] = [m for m in models if isinstance(m, str)]
+            # json.loads never yields str subclasses, so an exact type check is enough
+            out[name] = [m for m in models if type(m) is str]
     return out
 
 
@@ -305,7 +442,8 @@ def validate_config(cfg: Dict[str, Any]) -> List[str]:
         return problems
 
     if isinstance(router, dict):
-        model_map = list_models_by_provider(cfg)
+        # Sets, so each Router entry is checked without scanning a model list
+        model_map = {name: frozenset(models) for name, models in list_models_by_provider(cfg).items()}
         for k, v in router.items():
             # thresholds or non-route numeric fields: skip strict check
             if isinstance(v, (int, float, bool)) or v is None:
@@ -326,23 +464,32 @@ def validate_config(cfg: Dict[str, Any]) -> List[str]:
     return problems
 
 
+def _print_json(obj: Any) -> None:
+    if orjson is not None:
+        sys.stdout.write(_encode_json(obj).decode("utf-8"))
+    else:
+        # Encode straight into stdout rather than building the whole string first
+        json.dump(obj, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
 # ----------------------------
 # Commands: top-level CRUD
 # ----------------------------
 
 def cmd_show(cfg: Dict[str, Any], section: Optional[str]) -> None:
     if section in (None, "all"):
-        print(json.dumps(cfg, ensure_ascii=False, indent=2))
+        _print_json(cfg)
         return
     if section == "providers":
-        print(json.dumps({"Providers": get_providers(cfg)}, ensure_ascii=False, indent=2))
+        _print_json({"Providers": get_providers(cfg)})
         return
     if section == "router":
-        print(json.dumps({"Router": cfg.get("Router", {})}, ensure_ascii=False, indent=2))
+        _print_json({"Router": cfg.get("Router", {})})
         return
     if section == "general":
         general = {k: v for k, v in cfg.items() if k not in ("Providers", "Router")}
-        print(json.dumps(general, ensure_ascii=False, indent=2))
+        _print_json(general)
         return
     raise SystemExit(f"[ERROR] Unknown section: {section}")
 
@@ -350,7 +497,11 @@ def cmd_show(cfg: Dict[str, Any], section: Optional[str]) -> None:
 def cmd_get(cfg: Dict[str, Any], key: str) -> None:
     if key not in cfg:
         raise SystemExit(f"[ERROR] Key not found: {key}")
-    print(json.dumps(cfg[key], ensure_ascii=False, indent=2) if isinstance(cfg[key], (dict, list)) else cfg[key])
+    v = cfg[key]
+    if isinstance(v, (dict, list)):
+        _print_json(v)
+    else:
+        print(v)
 
 
 def cmd_set(cfg: Dict[str, Any], key: str, value: Any) -> None:
@@ -387,7 +538,7 @@ def providers_show(cfg: Dict[str, Any], name: str) -> None:
     _, pr = find_provider(cfg, name)
     if pr is None:
         raise SystemExit(f"[ERROR] Provider not found: {name}")
-    print(json.dumps(pr, ensure_ascii=False, indent=2))
+    _print_json(pr)
 
 
 def providers_add(cfg: Dict[str, Any], name: str, api_base_url: str, api_key: str,
@@ -407,6 +558,7 @@ def providers_add(cfg: Dict[str, Any], name: str, api_base_url: str, api_key: st
     if transformer is not None:
         pr["transformer"] = transformer
     cfg["Providers"].append(pr)
+    _invalidate_provider_index()
 
 
 def providers_remove(cfg: Dict[str, Any], name: str) -> None:
@@ -414,6 +566,7 @@ def providers_remove(cfg: Dict[str, Any], name: str) -> None:
     if idx == -1:
         raise SystemExit(f"[ERROR] Provider not found: {name}")
     cfg["Providers"].pop(idx)
+    _invalidate_provider_index()
 
 
 def providers_update(cfg: Dict[str, Any],
@@ -429,7 +582,9 @@ def providers_update(cfg: Dict[str, Any],
     if pr is None:
         raise SystemExit(f"[ERROR] Provider not found: {name}")
 
-    pr = copy.deepcopy(pr)
+    # Work on a shallow copy so an error below leaves cfg untouched; nested
+    # values are only ever replaced, never mutated (models is rebuilt)
+    pr = dict(pr)
 
     # rename
     if rename:
@@ -440,8 +595,7 @@ def providers_update(cfg: Dict[str, Any],
         pr["name"] = rename
 
     # update URL/key, respecting existing style if present
-    url_key = _provider_key(pr, "api_base_url", "baseUrl")
-    key_key = _provider_key(pr, "api_key", "apiKey")
+    url_key, key_key = _resolve_keys(pr)
 
     if api_base_url is not None:
         pr[url_key] = api_base_url
@@ -456,11 +610,14 @@ def providers_update(cfg: Dict[str, Any],
         cur_models = []
     cur_models = [m for m in cur_models if isinstance(m, str)]
 
+    present = set(cur_models)
     for m in models_add:
-        if m not in cur_models:
+        if m not in present:
+            present.add(m)
             cur_models.append(m)
-    for m in models_remove:
-        cur_models = [x for x in cur_models if x != m]
+    if models_remove:
+        drop = set(models_remove)
+        cur_models = [x for x in cur_models if x not in drop]
     pr["models"] = cur_models
 
     # transformer (replace)
@@ -478,6 +635,9 @@ def providers_update(cfg: Dict[str, Any],
 
     # write back
     cfg["Providers"][idx] = pr
+    # --set name=... renames as well as rename does
+    if pr.get("name") != name:
+        _invalidate_provider_index()
 
 
 # ----------------------------
@@ -488,7 +648,7 @@ def router_show(cfg: Dict[str, Any]) -> None:
     r = cfg.get("Router", {})
     if not isinstance(r, dict):
         raise SystemExit("[ERROR] Router is not an object.")
-    print(json.dumps(r, ensure_ascii=False, indent=2))
+    _print_json(r)
 
 
 def router_get(cfg: Dict[str, Any], key: str) -> None:
@@ -498,7 +658,10 @@ def router_get(cfg: Dict[str, Any], key: str) -> None:
     if key not in r:
         raise SystemExit(f"[ERROR] Router key not found: {key}")
     v = r[key]
-    print(json.dumps(v, ensure_ascii=False, indent=2) if isinstance(v, (dict, list)) else v)
+    if isinstance(v, (dict, list)):
+        _print_json(v)
+    else:
+        print(v)
 
 
 def router_set(cfg: Dict[str, Any], key: str, value: Any) -> None:
@@ -521,28 +684,53 @@ def router_del(cfg: Dict[str, Any], key: str) -> None:
 # Enhanced Interactive Mode with Rich TUI
 # ============================================================
 
+def _truncate(s: str, limit: int = 38, keep: int = 35) -> str:
+    return s if len(s) <= limit else f"{s[:keep]}..."
+
+
+def _format_models(models: Any) -> str:
+    # First three models, plus how many more there are
+    if not isinstance(models, list):
+        return "<invalid>"
+    if len(models) <= 3:
+        return ", ".join(models)
+    return f"{', '.join(models[:3])} (+{len(models) - 3})"
+
+
 class RichUI:
     """Rich-based UI components for enhanced interactivity."""
     
+    # Rich components resolved on first use (see __getattr__); rich.syntax
+    # alone pulls in pygments, which a session may never need
+    _LAZY_RICH = {
+        "_Table": ("rich.table", "Table"),
+        "_Panel": ("rich.panel", "Panel"),
+        "_Syntax": ("rich.syntax", "Syntax"),
+        "_Text": ("rich.text", "Text"),
+        "_box": ("rich.box", None),
+    }
+    
+    # Table cell markup by exact value type; json.loads only produces these
+    # exact types, and bool must not fall into the int style
+    _VALUE_MARKUP = {
+        bool: "[magenta]{}[/]",
+        int: "[yellow]{}[/]",
+        float: "[yellow]{}[/]",
+    }
+    
     def __init__(self):
         self.console = None
         self.inquirer = None
+        # (data, version, text) from the last print_json call given a version
+        self._json_cache: Optional[Tuple[Any, int, str]] = None
+        # table name -> (rows, Table) as last printed
+        self._tables: Dict[str, Tuple[List[Tuple[Any, ...]], Any]] = {}
         self._init_libs()
     
     def _init_libs(self):
         if _check_rich():
             from rich.console import Console
-            from rich.table import Table
-            from rich.panel import Panel
-            from rich.syntax import Syntax
-            from rich.text import Text
-            from rich import box
             self.console = Console()
-            self._Table = Table
-            self._Panel = Panel
-            self._Syntax = Syntax
-            self._Text = Text
-            self._box = box
         
         if _check_inquirer():
             from InquirerPy import inquirer
@@ -550,6 +738,16 @@ class RichUI:
             self.inquirer = inquirer
             self._Separator = Separator
     
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not set yet; cache the import on self
+        spec = RichUI._LAZY_RICH.get(name)
+        if spec is None or self.__dict__.get("console") is None:
+            raise AttributeError(name)
+        module = importlib.import_module(spec[0])
+        value = module if spec[1] is None else getattr(module, spec[1])
+        self.__dict__[name] = value
+        return value
+    
     @property
     def available(self) -> bool:
         return self.console is not None and self.inquirer is not None
@@ -591,9 +789,20 @@ class RichUI:
         else:
             print(f"[INFO] {msg}")
     
-    def print_json(self, data: Any, title: str = ""):
+    def _json_text(self, data: Any, version: Optional[int]) -> str:
+        # Callers pass a version that changes whenever data may have been
+        # edited; without one the text is always rebuilt
+        cached = self._json_cache
+        if version is not None and cached is not None and cached[0] is data and cached[1] == version:
+            return cached[2]
+        text = _encode_json(data).decode("utf-8")
+        if version is not None:
+            self._json_cache = (data, version, text)
+        return text
+    
+    def print_json(self, data: Any, title: str = "", version: Optional[int] = None):
         if self.console:
-            json_str = json.dumps(data, ensure_ascii=False, indent=2)
+            json_str = self._json_text(data, version)
             syntax = self._Syntax(json_str, "json", theme="monokai", line_numbers=False)
             if title:
                 self.console.print(self._Panel(syntax, title=title, border_style="blue"))
@@ -602,48 +811,76 @@ class RichUI:
         else:
             if title:
                 print(f"\n{title}:")
-            print(json.dumps(data, ensure_ascii=False, indent=2))
+            _print_json(data)
+    
+    def _cached_table(self, key: str, rows: List[Tuple[Any, ...]], new_table: Callable[[], Any]) -> Any:
+        # Menus redraw their table on every pass; only rebuild it when the
+        # rows differ from what was shown last time
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == rows:
+            return cached[1]
+        table = new_table()
+        for row in rows:
+            table.add_row(*row)
+        self._tables[key] = (rows, table)
+        return table
+    
+    def _new_providers_table(self) -> Any:
+        table = self._Table(
+            title="Providers",
+            box=self._box.ROUNDED,
+            show_header=True,
+            header_style="bold magenta"
+        )
+        table.add_column("#", style="dim", width=3)
+        table.add_column("Name", style="cyan", min_width=12)
+        table.add_column("API Base URL", style="dim", max_width=40)
+        table.add_column("Models", style="green")
+        table.add_column("Transformer", style="yellow", width=12)
+        return table
+    
+    @staticmethod
+    def _providers_snapshot(providers: List[Any]) -> Tuple[List[Any], List[Tuple[Any, ...]]]:
+        """Provider names and providers-table rows, from a single pass."""
+        names = []
+        rows = []
+        for i, pr in enumerate(providers):
+            if not isinstance(pr, dict):
+                rows.append((str(i), "[red]<invalid>[/]", "", "", ""))
+                continue
+            name = pr.get("name")
+            if name:
+                names.append(name)
+            url = _truncate(pr.get("api_base_url", pr.get("baseUrl", "")))
+            has_transformer = "✓" if pr.get("transformer") else ""
+            rows.append((str(i), pr.get("name", "<no-name>"), url,
+                         _format_models(pr.get("models", [])), has_transformer))
+        return names, rows
     
-    def print_providers_table(self, cfg: Dict[str, Any]):
+    def print_providers_table(self, cfg: Dict[str, Any]) -> List[Any]:
+        """Show the providers table and return the provider names it lists."""
         providers = get_providers(cfg)
         if not providers:
             self.print_warning("No providers configured")
-            return
+            return []
         
+        names, rows = self._providers_snapshot(providers)
         if self.console:
-            table = self._Table(
-                title="Providers",
-                box=self._box.ROUNDED,
-                show_header=True,
-                header_style="bold magenta"
-            )
-            table.add_column("#", style="dim", width=3)
-            table.add_column("Name", style="cyan", min_width=12)
-            table.add_column("API Base URL", style="dim", max_width=40)
-            table.add_column("Models", style="green")
-            table.add_column("Transformer", style="yellow", width=12)
-            
-            for i, pr in enumerate(providers):
-                if not isinstance(pr, dict):
-                    table.add_row(str(i), "[red]<invalid>[/]", "", "", "")
-                    continue
-                name = pr.get("name", "<no-name>")
-                url = pr.get("api_base_url", pr.get("baseUrl", ""))
-                if len(url) > 38:
-                    url = url[:35] + "..."
-                models = pr.get("models", [])
-                if isinstance(models, list):
-                    model_str = ", ".join(models[:3])
-                    if len(models) > 3:
-                        model_str += f" (+{len(models)-3})"
-                else:
-                    model_str = "<invalid>"
-                has_transformer = "✓" if pr.get("transformer") else ""
-                table.add_row(str(i), name, url, model_str, has_transformer)
-            
-            self.console.print(table)
+            self.console.print(self._cached_table("providers", rows, self._new_providers_table))
         else:
             providers_list(cfg)
+        return names
+    
+    def _new_router_table(self) -> Any:
+        table = self._Table(
+            title="Router Configuration",
+            box=self._box.ROUNDED,
+            show_header=True,
+            header_style="bold magenta"
+        )
+        table.add_column("Route Key", style="cyan", min_width=18)
+        table.add_column("Value", style="green")
+        return table
     
     def print_router_table(self, cfg: Dict[str, Any]):
         router = cfg.get("Router", {})
@@ -652,29 +889,31 @@ class RichUI:
             return
         
         if self.console:
-            table = self._Table(
-                title="Router Configuration",
-                box=self._box.ROUNDED,
-                show_header=True,
-                header_style="bold magenta"
-            )
-            table.add_column("Route Key", style="cyan", min_width=18)
-            table.add_column("Value", style="green")
-            
+            rows = []
+            markup = self._VALUE_MARKUP
             for k, v in router.items():
-                if isinstance(v, str):
-                    table.add_row(k, v)
-                elif isinstance(v, (int, float)):
-                    table.add_row(k, f"[yellow]{v}[/]")
-                elif isinstance(v, bool):
-                    table.add_row(k, f"[magenta]{v}[/]")
-                else:
-                    table.add_row(k, f"[dim]{json.dumps(v)}[/]")
+                if type(v) is str:
+                    rows.append((k, v))
+                    continue
+                fmt = markup.get(type(v))
+                rows.append((k, fmt.format(v) if fmt else f"[dim]{json.dumps(v)}[/]"))
             
-            self.console.print(table)
+            self.console.print(self._cached_table("router", rows, self._new_router_table))
         else:
             router_show(cfg)
     
+    def _new_general_table(self) -> Any:
+        table = self._Table(
+            title="General Settings",
+            box=self._box.ROUNDED,
+            show_header=True,
+            header_style="bold magenta"
+        )
+        table.add_column("Key", style="cyan", min_width=20)
+        table.add_column("Value", style="green")
+        table.add_column("Type", style="dim", width=8)
+        return table
+    
     def print_general_table(self, cfg: Dict[str, Any]):
         general = {k: v for k, v in cfg.items() if k not in ("Providers", "Router")}
         if not general:
@@ -682,32 +921,21 @@ class RichUI:
             return
         
         if self.console:
-            table = self._Table(
-                title="General Settings",
-                box=self._box.ROUNDED,
-                show_header=True,
-                header_style="bold magenta"
-            )
-            table.add_column("Key", style="cyan", min_width=20)
-            table.add_column("Value", style="green")
-            table.add_column("Type", style="dim", width=8)
-            
+            rows = []
+            markup = self._VALUE_MARKUP
             for k, v in general.items():
-                vtype = type(v).__name__
-                if isinstance(v, str):
+                vt = type(v)
+                if vt is str:
                     # Mask API keys
                     display = v if "key" not in k.lower() or len(v) < 8 else v[:4] + "****" + v[-4:]
-                    table.add_row(k, display, vtype)
-                elif isinstance(v, bool):
-                    table.add_row(k, f"[magenta]{v}[/]", vtype)
-                elif isinstance(v, (int, float)):
-                    table.add_row(k, f"[yellow]{v}[/]", vtype)
                 else:
-                    table.add_row(k, f"[dim]{json.dumps(v)[:50]}[/]", vtype)
+                    fmt = markup.get(vt)
+                    display = fmt.format(v) if fmt else f"[dim]{json.dumps(v)[:50]}[/]"
+                rows.append((k, display, vt.__name__))
             
-            self.console.print(table)
+            self.console.print(self._cached_table("general", rows, self._new_general_table))
         else:
-            print(json.dumps(general, ensure_ascii=False, indent=2))
+            _print_json(general)
     
     def select(self, message: str, choices: List[dict], default: str = None) -> str:
         """
@@ -853,6 +1081,8 @@ def interactive_enhanced(cfg: Dict[str, Any], path: str) -> Dict[str, Any]:
     )
     
     modified = False
+    # Bumped before each submenu, since any of them may edit cfg in place
+    cfg_version = 0
     
     while True:
         # Main menu
@@ -885,7 +1115,7 @@ def interactive_enhanced(cfg: Dict[str, Any], path: str) -> Dict[str, Any]:
                 ]
             )
             if view_action == "all":
-                ui.print_json(cfg, "Full Configuration")
+                ui.print_json(cfg, "Full Configuration", version=cfg_version)
             elif view_action == "general":
                 ui.print_general_table(cfg)
             elif view_action == "providers":
@@ -894,12 +1124,15 @@ def interactive_enhanced(cfg: Dict[str, Any], path: str) -> Dict[str, Any]:
                 ui.print_router_table(cfg)
         
         elif action == "general":
+            cfg_version += 1
             modified = _handle_general_menu(ui, cfg) or modified
         
         elif action == "providers":
+            cfg_version += 1
             modified = _handle_providers_menu(ui, cfg) or modified
         
         elif action == "router":
+            cfg_version += 1
             modified = _handle_router_menu(ui, cfg) or modified
         
         elif action == "validate":
@@ -1011,7 +1244,7 @@ def _handle_providers_menu(ui: RichUI, cfg: Dict[str, Any]) -> bool:
     modified = False
     
     while True:
-        ui.print_providers_table(cfg)
+        provider_names = ui.print_providers_table(cfg)
         
         action = ui.select(
             "Providers",
@@ -1027,8 +1260,6 @@ def _handle_providers_menu(ui: RichUI, cfg: Dict[str, Any]) -> bool:
         if action == "back":
             return modified
         
-        provider_names = [pr.get("name") for pr in get_providers(cfg) if isinstance(pr, dict) and pr.get("name")]
-        
         if action == "add":
             name = ui.input_text("Provider name (e.g., openrouter, deepseek)")
             if not name:
@@ -1259,7 +1490,8 @@ def _handle_router_menu(ui: RichUI, cfg: Dict[str, Any]) -> bool:
             if action == "edit":
                 key = ui.fuzzy_select("Select route to edit", existing_keys)
             else:
-                key_choices = [{"name": k, "value": k} for k in ROUTE_TYPES if k not in existing_keys]
+                existing = set(existing_keys)
+                key_choices = [{"name": k, "value": k} for k in ROUTE_TYPES if k not in existing]
                 key_choices.append({"name": "Custom key...", "value": "_custom"})
                 
                 key = ui.select("Route type", key_choices)
@@ -1374,7 +1606,7 @@ def interactive_fallback(cfg: Dict[str, Any]) -> Dict[str, Any]:
         elif choice == "2":
             print("\nGeneral keys (excluding Providers/Router):")
             general = {k: v for k, v in cfg.items() if k not in ("Providers", "Router")}
-            print(json.dumps(general, ensure_ascii=False, indent=2))
+            _print_json(general)
             print("\nActions:")
             print("  a) set key")
             print("  b) delete key")
@@ -1423,7 +1655,7 @@ def interactive_fallback(cfg: Dict[str, Any]) -> Dict[str, Any]:
                     if pr is None:
                         print("[ERROR] provider not found")
                         continue
-                    print(json.dumps(pr, ensure_ascii=False, indent=2))
+                    _print_json(pr)
                     print("Edit fields:")
                     rename = _prompt("rename (empty to skip)", "")
                     url = _prompt("api_base_url (empty to skip)", "")
@@ -1718,7 +1950,7 @@ def main() -> None:
     if modified:
         if args.dry_run:
             print("[DRY-RUN] Would write config:")
-            print(json.dumps(cfg, ensure_ascii=False, indent=2))
+            _print_json(cfg)
             return
 
         if not args.no_backup:
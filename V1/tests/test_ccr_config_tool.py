@@ -0,0 +1,56 @@
+import importlib.util
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "skills" / "scripts" / "ai" / "ccr_config_tool_TUI.py"
+_spec = importlib.util.spec_from_file_location("ccr_config_tool_TUI", _SCRIPT)
+ccr = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ccr)
+
+
+class ConfigRoundTripTests(unittest.TestCase):
+    def test_nan_loaded_from_file_survives_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "config.json")
+            Path(path).write_text('{"RATIO": NaN, "LOG": true}', encoding="utf-8")
+
+            cfg = ccr.load_config(path)
+            cfg["LOG"] = False
+            ccr.atomic_write_json(path, cfg)
+
+            text = Path(path).read_text(encoding="utf-8")
+            reloaded = ccr.load_config(path)
+
+        self.assertIn('"RATIO": NaN', text)
+        self.assertTrue(math.isnan(reloaded["RATIO"]))
+
+    def test_non_finite_value_set_in_memory_is_not_written_as_null(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "config.json")
+            ccr.atomic_write_json(path, {"RATIO": float("inf"), "API_KEY": None})
+
+            text = Path(path).read_text(encoding="utf-8")
+
+        self.assertIn('"RATIO": Infinity', text)
+        self.assertIn('"API_KEY": null', text)
+
+
+class FindProviderTests(unittest.TestCase):
+    def test_lookups_follow_in_place_edits_and_prefer_the_first_duplicate(self):
+        cfg = {"Providers": [{"name": "a"}, {"name": "b"}, {"name": "a", "models": ["dup"]}]}
+        self.assertEqual(ccr.find_provider(cfg, "a"), (0, {"name": "a"}))
+
+        ccr.providers_update(cfg, "b", None, None, None, [], [], None, ["name=c"])
+        self.assertEqual(ccr.find_provider(cfg, "c")[0], 1)
+        self.assertEqual(ccr.find_provider(cfg, "b"), (-1, None))
+
+        ccr.providers_remove(cfg, "c")
+        ccr.providers_add(cfg, "d", "https://example.invalid", "key", [], None)
+        self.assertEqual(ccr.find_provider(cfg, "d")[0], 2)
+        self.assertEqual(ccr.find_provider(cfg, "c"), (-1, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,11 @@
 import os
+import sys
 import unittest
-from types import SimpleNamespace
-from unittest.mock import patch
+from types import ModuleType, SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from anuris.config import Config
-from anuris.model import ChatModel
+from anuris.model import _HTTP_LIMITS, ChatModel
 
 
 class FakeCompletions:
@@ -190,11 +191,19 @@ class ChatModelReasoningTests(unittest.TestCase):
         self.assertEqual(len(failing.calls), 1)
 
 
+def _fake_httpx_socks():
+    """Stand-in httpx_socks module whose SyncProxyTransport.from_url is a mock."""
+    module = ModuleType("httpx_socks")
+    module.SyncProxyTransport = SimpleNamespace(from_url=MagicMock())
+    return module
+
+
 class ChatModelProxyTests(unittest.TestCase):
     @patch("anuris.model.OpenAI")
     @patch("anuris.model.httpx.Client")
-    @patch("anuris.model.SyncProxyTransport.from_url")
-    def test_config_socks_proxy_normalizes_socks_scheme(self, mock_from_url, mock_httpx_client, mock_openai):
+    def test_config_socks_proxy_normalizes_socks_scheme(self, mock_httpx_client, mock_openai):
+        fake_socks = _fake_httpx_socks()
+        mock_from_url = fake_socks.SyncProxyTransport.from_url
         transport = object()
         http_client = object()
         mock_from_url.return_value = transport
@@ -207,7 +216,8 @@ class ChatModelProxyTests(unittest.TestCase):
             proxy="socks://127.0.0.1:8990",
         )
 
-        ChatModel(config)
+        with patch.dict(sys.modules, {"httpx_socks": fake_socks}):
+            ChatModel(config)
 
         mock_from_url.assert_called_once_with("socks5://127.0.0.1:8990")
         mock_httpx_client.assert_called_once()
@@ -221,10 +231,9 @@ class ChatModelProxyTests(unittest.TestCase):
     @patch.dict(os.environ, {"ALL_PROXY": "socks://127.0.0.1:8990"}, clear=True)
     @patch("anuris.model.OpenAI")
     @patch("anuris.model.httpx.Client")
-    @patch("anuris.model.SyncProxyTransport.from_url")
-    def test_env_socks_proxy_used_when_config_proxy_empty(
-        self, mock_from_url, mock_httpx_client, mock_openai
-    ):
+    def test_env_socks_proxy_used_when_config_proxy_empty(self, mock_httpx_client, mock_openai):
+        fake_socks = _fake_httpx_socks()
+        mock_from_url = fake_socks.SyncProxyTransport.from_url
         transport = object()
         http_client = object()
         mock_from_url.return_value = transport
@@ -237,7 +246,8 @@ class ChatModelProxyTests(unittest.TestCase):
             proxy="",
         )
 
-        ChatModel(config)
+        with patch.dict(sys.modules, {"httpx_socks": fake_socks}):
+            ChatModel(config)
 
         mock_from_url.assert_called_once_with("socks5://127.0.0.1:8990")
         _, kwargs = mock_httpx_client.call_args
@@ -248,8 +258,7 @@ class ChatModelProxyTests(unittest.TestCase):
     @patch.dict(os.environ, {"ALL_PROXY": "socks://127.0.0.1:8990"}, clear=True)
     @patch("anuris.model.OpenAI")
     @patch("anuris.model.httpx.Client")
-    @patch("anuris.model.SyncProxyTransport.from_url")
-    def test_config_proxy_overrides_env_proxy(self, mock_from_url, mock_httpx_client, mock_openai):
+    def test_config_proxy_overrides_env_proxy(self, mock_httpx_client, mock_openai):
         http_client = object()
         mock_httpx_client.return_value = http_client
 
@@ -260,10 +269,16 @@ class ChatModelProxyTests(unittest.TestCase):
             proxy="http://127.0.0.1:8080",
         )
 
-        ChatModel(config)
+        with patch.dict(sys.modules):
+            sys.modules.pop("httpx_socks", None)
+            ChatModel(config)
+            self.assertNotIn("httpx_socks", sys.modules)
 
-        mock_from_url.assert_not_called()
-        mock_httpx_client.assert_called_once_with(proxy="http://127.0.0.1:8080", trust_env=False)
+        mock_httpx_client.assert_called_once_with(
+            proxy="http://127.0.0.1:8080",
+            limits=_HTTP_LIMITS,
+            trust_env=False,
+        )
         self.assertIs(mock_openai.call_args.kwargs.get("http_client"), http_client)
 
     @patch.dict(
@@ -273,8 +288,7 @@ class ChatModelProxyTests(unittest.TestCase):
     )
     @patch("anuris.model.OpenAI")
     @patch("anuris.model.httpx.Client")
-    @patch("anuris.model.SyncProxyTransport.from_url")
-    def test_no_proxy_disables_system_proxy(self, mock_from_url, mock_httpx_client, mock_openai):
+    def test_no_proxy_disables_system_proxy(self, mock_httpx_client, mock_openai):
         http_client = object()
         mock_httpx_client.return_value = http_client
 
@@ -285,12 +299,24 @@ class ChatModelProxyTests(unittest.TestCase):
             proxy="",
         )
 
-        ChatModel(config)
+        with patch.dict(sys.modules):
+            sys.modules.pop("httpx_socks", None)
+            ChatModel(config)
+            self.assertNotIn("httpx_socks", sys.modules)
 
-        mock_from_url.assert_not_called()
-        mock_httpx_client.assert_called_once_with(trust_env=False)
+        mock_httpx_client.assert_called_once_with(limits=_HTTP_LIMITS, trust_env=False)
         self.assertIs(mock_openai.call_args.kwargs.get("http_client"), http_client)
 
+    @patch("anuris.model.OpenAI")
+    @patch("anuris.model.httpx.Client")
+    def test_context_manager_closes_http_client(self, mock_httpx_client, mock_openai):
+        config = Config(api_key="test", base_url="https://api.example.com/v1", model="demo")
+
+        with ChatModel(config) as model:
+            self.assertIs(model.http_client, mock_httpx_client.return_value)
+
+        mock_httpx_client.return_value.close.assert_called_once_with()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,39 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from anuris.prompt_history import BufferedFileHistory
+
+
+class BufferedFileHistoryTests(unittest.TestCase):
+    def test_flushed_entries_round_trip_through_file_format(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "history")
+            history = BufferedFileHistory(path)
+            history.store_string("first")
+            history.store_string("multi\nline")
+            history.flush()
+
+            loaded = list(BufferedFileHistory(path).load_history_strings())
+
+        self.assertEqual(loaded, ["multi\nline", "first"])
+
+    def test_writer_thread_starts_on_first_stored_entry(self):
+        def writers():
+            return sum(thread.name == "history-writer" for thread in threading.enumerate())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            before = writers()
+            history = BufferedFileHistory(str(Path(tmp) / "history"))
+            self.assertEqual(writers(), before)
+
+            history.store_string("first")
+            history.store_string("second")
+            history.flush()
+
+        self.assertEqual(writers(), before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 from types import SimpleNamespace
 
+from openai.types.chat import ChatCompletionChunk
+
 from anuris.streaming import StreamRenderer
 
 
@@ -61,6 +63,34 @@ class StreamRendererTests(unittest.TestCase):
         self.assertEqual(result.reasoning_content, "secret")
         self.assertEqual(result.full_response, "Hello World")
 
+    def test_detects_think_tags_split_across_deltas(self):
+        stream = [
+            make_chunk(content="Hi <thi"),
+            make_chunk(content="nk>plan</th"),
+            make_chunk(content="ink> done <"),
+        ]
+
+        result = self.renderer.process(stream)
+
+        self.assertEqual(result.reasoning_content, "plan")
+        self.assertEqual(result.full_response, "Hi  done <")
+
+    def test_handles_open_and_close_tags_in_one_delta(self):
+        stream = [make_chunk(content="<think>secret</think>World")]
+
+        result = self.renderer.process(stream)
+
+        self.assertEqual(result.reasoning_content, "secret")
+        self.assertEqual(result.full_response, "World")
+
+    def test_batches_text_writes_within_one_chunk(self):
+        # The held "<th" is released together with the rest of the next chunk.
+        stream = [make_chunk(content="x<th"), make_chunk(content="ey")]
+
+        self.renderer.process(stream)
+
+        self.assertEqual(self.ui.messages, ["\nAnuris: ", "x", "<they"])
+
     def test_returns_partial_output_when_interrupted(self):
         def interrupted_stream():
             yield make_chunk(content="Partial")
@@ -84,6 +114,40 @@ class StreamRendererTests(unittest.TestCase):
         self.assertEqual(result.reasoning_content, "I think step by step")
         self.assertEqual(result.full_response, "Answer")
 
+    def test_reads_reasoning_extras_from_sdk_chunks(self):
+        def sdk_chunk(delta):
+            return ChatCompletionChunk.model_validate(
+                {
+                    "id": "c",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "m",
+                    "choices": [{"index": 0, "delta": delta}],
+                }
+            )
+
+        stream = [
+            sdk_chunk({"role": "assistant", "content": None, "reasoning_content": "hmm"}),
+            sdk_chunk({"content": "Hi"}),
+        ]
+
+        result = self.renderer.process(stream)
+
+        self.assertEqual(result.reasoning_content, "hmm")
+        self.assertEqual(result.full_response, "Hi")
+
+    def test_supports_openai_dict_chunks(self):
+        stream = [
+            {"choices": [{"delta": {"reasoning_content": "hmm"}}]},
+            {"choices": [{"delta": {"content": "Hi"}}]},
+            {"choices": []},
+        ]
+
+        result = self.renderer.process(stream)
+
+        self.assertEqual(result.reasoning_content, "hmm")
+        self.assertEqual(result.full_response, "Hi")
+
     def test_supports_anthropic_content_block_events(self):
         stream = [
             {"type": "content_block_start", "content_block": {"type": "thinking", "thinking": "Plan"}},
@@ -98,6 +162,21 @@ class StreamRendererTests(unittest.TestCase):
         self.assertEqual(result.reasoning_content, "Plan first")
         self.assertEqual(result.full_response, "Hello World")
 
+    def test_text_is_written_before_the_stream_pauses(self):
+        ui = FakeUI()
+        written_during_pause = []
+
+        def paused_stream():
+            yield make_chunk(content="Hello")
+            # The server stalls here; "Hello" must already be on screen.
+            written_during_pause.extend(ui.messages)
+            yield make_chunk(content=" World")
+
+        result = StreamRenderer(ui).process(paused_stream())
+
+        self.assertIn("Hello", written_during_pause)
+        self.assertEqual(result.full_response, "Hello World")
+
 
 if __name__ == "__main__":
     unittest.main()